@@ -152,6 +152,25 @@ class Session(BaseModel):
     def __str__(self):
         return f"Session {self.id} - {self.patient} on {self.session_date}"
 
+    def to_claim_payload(self):
+        """
+        Build the claim preparation request body for this session.
+        
+        Related rows are referenced through their *_id columns, so no
+        practice, therapist or patient is fetched.
+        """
+        return {
+            'practice_id': str(self.practice_id),
+            'therapist_id': str(self.therapist_id),
+            'patient_id': str(self.patient_id),
+            'session_date': str(self.session_date),
+            'cpt_code': self.cpt_code,
+            'icd10_code': self.icd10_code,
+            'fee': str(self.fee),
+            'copay_collected': str(self.copay_collected),
+            'payer_id': self.payer_id,
+        }
+
 
 class Claim(BaseModel):
     """
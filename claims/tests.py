@@ -4,11 +4,15 @@ Claims API Tests - Therapy Practice Domain
 import pytest
 from decimal import Decimal
 from datetime import date, timedelta
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
+from hypothesis import example, given, strategies as st
+from rest_framework.authtoken.models import Token
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 from claims.models import Practice, Therapist, Patient, Session, Claim
+from claims.serializers import SessionClaimInputSerializer
+from healthcare.auth_models import User
 from claims.services import ClaimPreparationService, ClaimStatus
 from claims.validators import (
     SessionPayload,
@@ -18,6 +22,7 @@ from claims.validators import (
     CPTCodeValidator,
     ICD10CodeValidator,
     SessionDateValidator,
+    validate_session_payload,
 )
 
 
@@ -158,6 +163,59 @@ class ValidatorTestCase(TestCase):
         self.assertIn("cannot be in the future", errors[0])
 
 
+CLAIM_INPUTS = st.fixed_dictionaries({
+    "fee": st.decimals(min_value=-100, max_value=1000, places=2),
+    "copay_collected": st.decimals(min_value=-50, max_value=1000, places=2),
+    "cpt_code": st.one_of(
+        st.sampled_from(sorted(CPTCodeValidator.ALLOWED_CPT_CODES)),
+        st.text(alphabet="0123456789", min_size=5, max_size=5)
+    ),
+    # Either well-formed, or starting with a digit
+    "icd10_code": st.one_of(
+        st.from_regex(r"[A-Z][0-9]{2}(\.[0-9]{1,2})?", fullmatch=True),
+        st.from_regex(r"[0-9][0-9A-Z.]{2,6}", fullmatch=True)
+    ),
+    "session_date": st.dates(min_value=date(2020, 1, 1), max_value=date(2030, 1, 1)),
+})
+
+
+class ValidatorPropertyTestCase(SimpleTestCase):
+    """Test the full validator chain against generated payloads"""
+    
+    @given(claim=CLAIM_INPUTS)
+    # The hand-written failure scenarios, pinned as regressions
+    @example(claim={"fee": Decimal("175.00"), "copay_collected": Decimal("200.00"),
+                    "cpt_code": "90837", "icd10_code": "F33.1", "session_date": date(2024, 1, 15)})
+    @example(claim={"fee": Decimal("175.00"), "copay_collected": Decimal("25.00"),
+                    "cpt_code": "99999", "icd10_code": "F33.1", "session_date": date(2024, 1, 15)})
+    @example(claim={"fee": Decimal("0.00"), "copay_collected": Decimal("0.00"),
+                    "cpt_code": "90837", "icd10_code": "F33.1", "session_date": date(2024, 1, 15)})
+    @example(claim={"fee": Decimal("175.00"), "copay_collected": Decimal("25.00"),
+                    "cpt_code": "90837", "icd10_code": "F33.1", "session_date": date(2029, 1, 15)})
+    @example(claim={"fee": Decimal("175.00"), "copay_collected": Decimal("25.00"),
+                    "cpt_code": "90837", "icd10_code": "123", "session_date": date(2024, 1, 15)})
+    def test_claim_validation_matches_business_rules(self, claim):
+        """Test that a claim is accepted exactly when every business rule holds."""
+        payload = SessionPayload(
+            practice_id="practice_123",
+            therapist_id="therapist_456",
+            patient_id="patient_789",
+            payer_id="BCBSMA",
+            **claim
+        )
+        
+        expected_valid = (
+            claim["fee"] > 0
+            and 0 <= claim["copay_collected"] <= claim["fee"]
+            and claim["cpt_code"] in CPTCodeValidator.ALLOWED_CPT_CODES
+            and claim["icd10_code"][0].isalpha()
+            and claim["session_date"] <= date.today()
+        )
+        
+        errors = validate_session_payload(payload)
+        self.assertEqual(not errors, expected_valid, errors)
+
+
 class ClaimPreparationServiceTestCase(TestCase):
     """Test the claim preparation service"""
     
@@ -323,6 +381,49 @@ class ClaimAPITestCase(APITestCase):
         self.assertEqual(response.data['service'], 'clara-claims-api')
 
 
+@override_settings(ROOT_URLCONF='config.urls')
+class ClaimAPIPracticeContextTestCase(APITestCase):
+    """Test claim preparation for a token user with an active practice"""
+    
+    def setUp(self):
+        self.practice = Practice.objects.create(
+            name="Test Therapy Practice",
+            npi="1234567890",
+            tax_id="XX-XXXXXXX",
+            address_line1="123 Main St",
+            city="Boston",
+            state="MA",
+            zip_code="02101"
+        )
+        self.user = User.objects.create_user(
+            username="billing",
+            password="SecurePass123!",
+            active_practice=self.practice
+        )
+        token = Token.objects.create(user=self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+    
+    def test_prepare_claim_uses_active_practice(self):
+        """Test that the caller's active practice replaces the body's practice_id"""
+        data = {
+            "practice_id": "other_practice",
+            "therapist_id": "therapist_456",
+            "patient_id": "patient_789",
+            "session_date": str(date.today()),
+            "cpt_code": "90837",
+            "icd10_code": "F33.1",
+            "fee": 175.00,
+            "copay_collected": 25.00,
+            "payer_id": "BCBSMA"
+        }
+        
+        response = self.client.post('/api/v1/claims/prepare', data, format='json')
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'READY_FOR_SUBMISSION')
+        self.assertEqual(response.data['practice_id'], str(self.practice.id))
+
+
 class ModelTestCase(TestCase):
     """Test Django models for therapy practice domain"""
     
@@ -444,4 +545,53 @@ class ModelTestCase(TestCase):
         self.assertEqual(claim.practice, self.practice)
         self.assertEqual(claim.session, session)
         self.assertEqual(str(claim), "Claim CLM-12345678 - ready")
-        self.assertEqual(claim.status, Claim.Status.READY_FOR_SUBMISSION)
\ No newline at end of file
+        self.assertEqual(claim.status, Claim.Status.READY_FOR_SUBMISSION)
+    
+    def test_session_to_claim_payload(self):
+        therapist = Therapist.objects.create(
+            practice=self.practice,
+            first_name="Jane",
+            last_name="Smith",
+            npi="0987654321",
+            license_number="PSY12345",
+            license_state="MA"
+        )
+        
+        patient = Patient.objects.create(
+            practice=self.practice,
+            first_name="John",
+            last_name="Doe",
+            date_of_birth=date(1990, 1, 1)
+        )
+        
+        session_date = date.today() - timedelta(days=1)
+        created = Session.objects.create(
+            practice=self.practice,
+            therapist=therapist,
+            patient=patient,
+            session_date=session_date,
+            cpt_code="90837",
+            icd10_code="F33.1",
+            fee=Decimal("175.00"),
+            copay_collected=Decimal("25.00"),
+            payer_id="BCBSMA"
+        )
+        session = Session.objects.get(pk=created.pk)
+        
+        with self.assertNumQueries(0):
+            payload = session.to_claim_payload()
+        
+        self.assertEqual(payload, {
+            "practice_id": str(self.practice.id),
+            "therapist_id": str(therapist.id),
+            "patient_id": str(patient.id),
+            "session_date": session_date.isoformat(),
+            "cpt_code": "90837",
+            "icd10_code": "F33.1",
+            "fee": "175.00",
+            "copay_collected": "25.00",
+            "payer_id": "BCBSMA",
+        })
+        
+        serializer = SessionClaimInputSerializer(data=payload)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
\ No newline at end of file
@@ -75,9 +75,9 @@ class PrepareClaimView(APIView):
         
         # Add practice context from user (if authenticated)
         if hasattr(request, 'practice_id'):
-            payload['practice_id'] = request.practice_id
-        elif hasattr(request.user, 'active_practice') and request.user.active_practice:
-            payload['practice_id'] = request.user.active_practice.id
+            payload.practice_id = str(request.practice_id)
+        elif getattr(request.user, 'active_practice_id', None):
+            payload.practice_id = str(request.user.active_practice_id)
         
         # Prepare claim using service layer
         service = ClaimPreparationService()
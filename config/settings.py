@@ -83,6 +83,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     # Custom middleware
+    'healthcare.middleware.ClaraAuthContextMiddleware',
     'healthcare.middleware.TenantMiddleware',
     'healthcare.middleware.AuditLoggingMiddleware',
 ]
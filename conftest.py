@@ -0,0 +1,37 @@
+"""
+Shared pytest fixtures for the API test scripts.
+"""
+import pytest
+import requests
+from django.test.utils import override_settings
+
+from healthcare.testing import register_practice
+
+
+@pytest.fixture(scope="session")
+def session():
+    """One keep-alive HTTP session per test process (per worker under xdist)."""
+    with requests.Session() as http:
+        yield http
+
+
+@pytest.fixture(scope="session")
+def registered_practice(django_db_setup, django_db_blocker):
+    """
+    Practice 1 with its admin, registered once per test session.
+    
+    Tests that consume it run inside transactions, so the committed rows
+    are seen unchanged by every test and deleted at teardown.
+    """
+    with django_db_blocker.unblock(), override_settings(ROOT_URLCONF='config.urls'):
+        registration = register_practice()
+    
+    yield registration
+    
+    from claims.models import Practice
+    from healthcare.auth_models import User
+    
+    with django_db_blocker.unblock():
+        User.objects.filter(id=registration['user']['id']).delete()
+        Practice.objects.filter(id=registration['practice']['id']).delete()
+
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class HealthcareConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'healthcare'
-    verbose_name = 'Healthcare Management'
\ No newline at end of file
+    verbose_name = 'Healthcare Management'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -82,10 +82,10 @@ class LoginView(APIView):
             token, created = Token.objects.get_or_create(user=user)
             
             # Log login
-            if user.active_practice:
+            if user.active_practice_id:
                 AuditLog.objects.create(
                     user=user,
-                    practice=user.active_practice,
+                    practice_id=user.active_practice_id,
                     action=AuditLog.Action.VIEW,
                     resource_type='Login',
                     resource_id=str(user.id),
@@ -166,23 +166,23 @@ class InvitationViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         user = self.request.user
-        if not user.active_practice:
+        if not user.active_practice_id:
             return PracticeInvitation.objects.none()
         
         # Admins see all practice invitations
         membership = user.practice_memberships.filter(
-            practice=user.active_practice,
+            practice_id=user.active_practice_id,
             is_active=True
         ).first()
         
         if membership and membership.role == User.Role.ADMIN:
             return PracticeInvitation.objects.filter(
-                practice=user.active_practice
+                practice_id=user.active_practice_id
             ).order_by('-created_at')
         
         # Others only see their own invitations
         return PracticeInvitation.objects.filter(
-            practice=user.active_practice,
+            practice_id=user.active_practice_id,
             invited_by=user
         ).order_by('-created_at')
     
@@ -201,7 +201,7 @@ class InvitationViewSet(viewsets.ModelViewSet):
             # Log invitation
             AuditLog.objects.create(
                 user=request.user,
-                practice=request.user.active_practice,
+                practice_id=request.user.active_practice_id,
                 action=AuditLog.Action.CREATE,
                 resource_type='Invitation',
                 resource_id=str(invitation.id),
@@ -305,11 +305,11 @@ class InvitationViewSet(viewsets.ModelViewSet):
     
     def has_admin_permission(self, user):
         """Check if user is admin of active practice."""
-        if not user.active_practice:
+        if not user.active_practice_id:
             return False
         
         membership = user.practice_memberships.filter(
-            practice=user.active_practice,
+            practice_id=user.active_practice_id,
             role=User.Role.ADMIN,
             is_active=True
         ).exists()
@@ -340,10 +340,10 @@ class UserProfileView(APIView):
             serializer.save()
             
             # Log profile update
-            if request.user.active_practice:
+            if request.user.active_practice_id:
                 AuditLog.objects.create(
                     user=request.user,
-                    practice=request.user.active_practice,
+                    practice_id=request.user.active_practice_id,
                     action=AuditLog.Action.UPDATE,
                     resource_type='UserProfile',
                     resource_id=str(request.user.id),
@@ -366,14 +366,14 @@ class PracticeMembersView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsPracticeAdmin]
     
     def get(self, request):
-        if not request.user.active_practice:
+        if not request.user.active_practice_id:
             return Response(
                 {'error': 'No active practice set'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
         memberships = PracticeMembership.objects.filter(
-            practice=request.user.active_practice,
+            practice_id=request.user.active_practice_id,
             is_active=True
         ).select_related('user', 'therapist')
         
@@ -0,0 +1,44 @@
+"""
+Authentication classes for the Clara API.
+"""
+from django.core.cache import cache
+from rest_framework.authentication import TokenAuthentication
+from rest_framework.settings import api_settings
+
+TOKEN_CACHE_TIMEOUT = 60  # seconds
+
+
+def token_cache_key(key):
+    """Cache key for an authentication token's (user, token) pair."""
+    return f"tok:{key}"
+
+
+def invalidate_token_cache(key):
+    """Drop a cached token after it or its user changes."""
+    cache.delete(token_cache_key(key))
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    Token authentication that caches the token and user lookup.
+    
+    Failed lookups raise before anything is cached. Entries are cleared by
+    the signal handlers when the token is deleted or its user is saved, so
+    logout, deactivation and practice switches take effect immediately.
+    """
+    
+    def authenticate_credentials(self, key):
+        authenticate = super().authenticate_credentials
+        return cache.get_or_set(
+            token_cache_key(key),
+            lambda: authenticate(key),
+            TOKEN_CACHE_TIMEOUT
+        )
+
+
+def token_cache_enabled():
+    """Whether DRF is configured to authenticate with CachedTokenAuthentication."""
+    return any(
+        issubclass(auth_class, CachedTokenAuthentication)
+        for auth_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    )
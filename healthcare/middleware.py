@@ -7,12 +7,16 @@ Ensures all database queries are automatically scoped to the correct tenant.
 import logging
 import uuid
 import json
+from dataclasses import dataclass
+from typing import Optional
 from django.db import connection
 from django.utils import timezone
+from django.utils.functional import SimpleLazyObject
 from django.http import JsonResponse
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.models import AnonymousUser
 from threading import local
+from .auth_models import PracticeMembership
 
 
 # Thread-local storage for tenant context
@@ -26,6 +30,52 @@ def get_current_practice_id():
     return getattr(_thread_locals, 'practice_id', None)
 
 
+def load_active_membership(user):
+    """
+    Get the user's active membership in their active practice.
+    
+    Returns None for anonymous users, users without an active practice,
+    and inactive memberships.
+    """
+    if not user or not user.is_authenticated or not user.active_practice_id:
+        return None
+    
+    return PracticeMembership.objects.filter(
+        user_id=user.id,
+        practice_id=user.active_practice_id,
+        is_active=True
+    ).first()
+
+
+@dataclass
+class ClaraContext:
+    """Per-request authorization context for the active practice."""
+    membership: Optional[PracticeMembership] = None
+    
+    @property
+    def role(self):
+        return self.membership.role if self.membership else None
+
+
+class ClaraAuthContextMiddleware:
+    """
+    Resolves the user's active practice membership once per request.
+    
+    DRF authenticates tokens inside the view, so the context is attached
+    lazily and resolved on first access - by then DRF has set request.user.
+    Permission classes read request.clara_context instead of querying.
+    """
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+    
+    def __call__(self, request):
+        request.clara_context = SimpleLazyObject(
+            lambda: ClaraContext(membership=load_active_membership(request.user))
+        )
+        return self.get_response(request)
+
+
 class TenantMiddleware:
     """
     Sets tenant context for each request based on user's practice.
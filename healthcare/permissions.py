@@ -5,6 +5,20 @@ Enforces practice-based data isolation and role-based permissions.
 """
 from rest_framework import permissions
 from .auth_models import User, PracticeMembership
+from .middleware import load_active_membership
+
+
+def get_active_membership(request):
+    """
+    Return the user's active membership in their active practice, or None.
+    
+    Read from the request's ClaraContext so every permission check in a
+    request shares the single lookup done by ClaraAuthContextMiddleware.
+    """
+    context = getattr(request, 'clara_context', None)
+    if context is None:
+        return load_active_membership(request.user)
+    return context.membership
 
 
 class IsPracticeMember(permissions.BasePermission):
@@ -18,24 +32,21 @@ class IsPracticeMember(permissions.BasePermission):
             return False
         
         # Must have an active practice set
-        if not request.user.active_practice:
+        if not request.user.active_practice_id:
             return False
         
         # Must be an active member of that practice
-        return request.user.practice_memberships.filter(
-            practice=request.user.active_practice,
-            is_active=True
-        ).exists()
+        return get_active_membership(request) is not None
     
     def has_object_permission(self, request, view, obj):
-        # Check if object has practice attribute
-        if hasattr(obj, 'practice'):
-            return obj.practice == request.user.active_practice
-        
-        # Check if object has practice_id attribute
+        # Compare FK ids so the related practice is never loaded
         if hasattr(obj, 'practice_id'):
             return obj.practice_id == request.user.active_practice_id
         
+        # Check if object only exposes a practice attribute
+        if hasattr(obj, 'practice'):
+            return obj.practice == request.user.active_practice
+        
         return True
 
 
@@ -50,15 +61,12 @@ class IsPracticeAdmin(permissions.BasePermission):
             return False
         
         # Must have an active practice set
-        if not request.user.active_practice:
+        if not request.user.active_practice_id:
             return False
         
         # Must be an admin of that practice
-        return request.user.practice_memberships.filter(
-            practice=request.user.active_practice,
-            role=User.Role.ADMIN,
-            is_active=True
-        ).exists()
+        membership = get_active_membership(request)
+        return membership is not None and membership.role == User.Role.ADMIN
 
 
 class IsPracticeOwner(permissions.BasePermission):
@@ -72,15 +80,12 @@ class IsPracticeOwner(permissions.BasePermission):
             return False
         
         # Must have an active practice set
-        if not request.user.active_practice:
+        if not request.user.active_practice_id:
             return False
         
         # Must be the owner of that practice
-        return request.user.practice_memberships.filter(
-            practice=request.user.active_practice,
-            is_owner=True,
-            is_active=True
-        ).exists()
+        membership = get_active_membership(request)
+        return membership is not None and membership.is_owner
 
 
 class IsTherapist(permissions.BasePermission):
@@ -94,27 +99,23 @@ class IsTherapist(permissions.BasePermission):
             return False
         
         # Must have an active practice set
-        if not request.user.active_practice:
+        if not request.user.active_practice_id:
             return False
         
         # Must be a therapist in that practice
-        return request.user.practice_memberships.filter(
-            practice=request.user.active_practice,
-            role=User.Role.THERAPIST,
-            is_active=True
-        ).exists()
+        membership = get_active_membership(request)
+        return membership is not None and membership.role == User.Role.THERAPIST
     
     def has_object_permission(self, request, view, obj):
         # For session/claim objects, check if user is the therapist
-        if hasattr(obj, 'therapist'):
-            membership = request.user.practice_memberships.filter(
-                practice=request.user.active_practice,
-                role=User.Role.THERAPIST,
-                is_active=True
-            ).first()
-            
-            if membership and membership.therapist:
-                return obj.therapist == membership.therapist
+        if hasattr(obj, 'therapist_id'):
+            membership = get_active_membership(request)
+            if (
+                membership is not None
+                and membership.role == User.Role.THERAPIST
+                and membership.therapist_id
+            ):
+                return obj.therapist_id == membership.therapist_id
         
         return True
 
@@ -130,15 +131,14 @@ class IsBillingStaff(permissions.BasePermission):
             return False
         
         # Must have an active practice set
-        if not request.user.active_practice:
+        if not request.user.active_practice_id:
             return False
         
         # Must be billing staff or admin
-        return request.user.practice_memberships.filter(
-            practice=request.user.active_practice,
-            role__in=[User.Role.BILLING, User.Role.ADMIN],
-            is_active=True
-        ).exists()
+        membership = get_active_membership(request)
+        return membership is not None and membership.role in [
+            User.Role.BILLING, User.Role.ADMIN
+        ]
 
 
 class CanSubmitClaims(permissions.BasePermission):
@@ -152,15 +152,14 @@ class CanSubmitClaims(permissions.BasePermission):
             return False
         
         # Must have an active practice set
-        if not request.user.active_practice:
+        if not request.user.active_practice_id:
             return False
         
         # Must have appropriate role
-        return request.user.practice_memberships.filter(
-            practice=request.user.active_practice,
-            role__in=[User.Role.THERAPIST, User.Role.BILLING, User.Role.ADMIN],
-            is_active=True
-        ).exists()
+        membership = get_active_membership(request)
+        return membership is not None and membership.role in [
+            User.Role.THERAPIST, User.Role.BILLING, User.Role.ADMIN
+        ]
 
 
 class ReadOnlyOrAdmin(permissions.BasePermission):
@@ -174,22 +173,19 @@ class ReadOnlyOrAdmin(permissions.BasePermission):
             return False
         
         # Must have an active practice set
-        if not request.user.active_practice:
+        if not request.user.active_practice_id:
+            return False
+        
+        membership = get_active_membership(request)
+        if membership is None:
             return False
         
         # Read permissions for any practice member
         if request.method in permissions.SAFE_METHODS:
-            return request.user.practice_memberships.filter(
-                practice=request.user.active_practice,
-                is_active=True
-            ).exists()
+            return True
         
         # Write permissions for admins only
-        return request.user.practice_memberships.filter(
-            practice=request.user.active_practice,
-            role=User.Role.ADMIN,
-            is_active=True
-        ).exists()
+        return membership.role == User.Role.ADMIN
 
 
 class HasPHITraining(permissions.BasePermission):
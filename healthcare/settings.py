@@ -63,6 +63,7 @@ MIDDLEWARE = [
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     
     # Custom middleware
+    'healthcare.middleware.ClaraAuthContextMiddleware',
     'healthcare.middleware.TenantMiddleware',
     'healthcare.middleware.AuditLoggingMiddleware',
 ]
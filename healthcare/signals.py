@@ -0,0 +1,31 @@
+"""
+Signal handlers for the healthcare app.
+
+Keeps cached auth tokens in sync with the database. The handlers are only
+connected when CachedTokenAuthentication is enabled; otherwise nothing is
+cached and a user save shouldn't pay for a token query.
+"""
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+from rest_framework.authtoken.models import Token
+
+from .authentication import invalidate_token_cache, token_cache_enabled
+
+
+def clear_cached_token(sender, instance, **kwargs):
+    """Invalidate a cached token when it is deleted (e.g. on logout)."""
+    invalidate_token_cache(instance.key)
+
+
+def clear_cached_user_tokens(sender, instance, created, **kwargs):
+    """Invalidate cached tokens holding a stale copy of the saved user."""
+    if created:
+        return
+    
+    for key in Token.objects.filter(user_id=instance.pk).values_list('key', flat=True):
+        invalidate_token_cache(key)
+
+
+if token_cache_enabled():
+    post_delete.connect(clear_cached_token, sender=Token)
+    post_save.connect(clear_cached_user_tokens, sender=settings.AUTH_USER_MODEL)
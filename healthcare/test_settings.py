@@ -0,0 +1,25 @@
+"""
+Django settings for running the test suite.
+
+Extends the project settings with overrides that only make sense in tests.
+"""
+from .settings import *  # noqa: F401,F403
+
+# PBKDF2 is deliberately slow; tests don't need production-strength hashes
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# Serve repeated token lookups from the cache; LocMem keeps tests free of Redis
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'healthcare.authentication.CachedTokenAuthentication',
+    ],
+}
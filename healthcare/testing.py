@@ -0,0 +1,35 @@
+"""
+Helpers shared by the API test scripts and their pytest fixtures.
+"""
+import uuid
+
+from django.test import Client
+
+
+def register_practice(client=None, path='/api/v1/auth/register-practice/'):
+    """
+    Register a practice and its owner admin through the API.
+    
+    Identifiers carry a random suffix so the call can be repeated against a
+    database that keeps earlier registrations. Returns the response data
+    with the admin's password added for login checks.
+    """
+    suffix = uuid.uuid4().hex[:8]
+    data = {
+        'practice_name': 'Mindful Therapy Center',
+        'tax_id': f'12-{suffix}',
+        'npi': str(uuid.uuid4().int)[:10],
+        'address': '123 Wellness Way',
+        'city': 'San Francisco',
+        'state': 'CA',
+        'zip_code': '94102',
+        'username': f'admin_{suffix}',
+        'email': f'admin_{suffix}@mindful.com',
+        'password': 'SecurePass123!',
+        'first_name': 'Sarah',
+        'last_name': 'Johnson'
+    }
+    
+    response = (client or Client()).post(path, data, content_type='application/json')
+    assert response.status_code == 201, f"Registration failed: {response.content.decode()}"
+    return {**response.json(), 'password': data['password']}
@@ -0,0 +1,275 @@
+"""
+Healthcare Auth Tests - Practice Context and Permissions
+"""
+import uuid
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import TestCase, RequestFactory, override_settings
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from claims.models import Practice, Therapist, Session
+from healthcare.auth_models import User, PracticeMembership
+from healthcare.authentication import (
+    CachedTokenAuthentication,
+    token_cache_enabled,
+    token_cache_key,
+)
+from healthcare.middleware import ClaraAuthContextMiddleware
+from healthcare.permissions import (
+    get_active_membership,
+    IsPracticeMember,
+    IsPracticeAdmin,
+    IsPracticeOwner,
+    IsTherapist,
+    IsBillingStaff,
+    CanSubmitClaims,
+    ReadOnlyOrAdmin,
+)
+
+
+def create_member(practice, role, **membership_fields):
+    """Create a user whose active practice is practice, with a membership in it."""
+    user = User.objects.create_user(
+        username=f"{role}_{uuid.uuid4().hex[:8]}",
+        password="SecurePass123!",
+        role=role,
+        active_practice=practice
+    )
+    PracticeMembership.objects.create(
+        user=user,
+        practice=practice,
+        role=role,
+        **membership_fields
+    )
+    return user
+
+
+class PracticeContextTestCase(TestCase):
+    """Shared practice and members for the context and permission tests"""
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.practice = Practice.objects.create(name="Test Practice", npi="1111111111")
+        cls.other_practice = Practice.objects.create(name="Other Practice", npi="2222222222")
+        cls.therapist = Therapist.objects.create(
+            practice=cls.practice,
+            first_name="Jane",
+            last_name="Smith",
+            npi="3333333333"
+        )
+        cls.admin = create_member(cls.practice, User.Role.ADMIN, is_owner=True)
+        cls.billing = create_member(cls.practice, User.Role.BILLING)
+        cls.front_desk = create_member(cls.practice, User.Role.FRONT_DESK)
+        cls.therapist_user = create_member(
+            cls.practice, User.Role.THERAPIST, therapist=cls.therapist
+        )
+    
+    def setUp(self):
+        self.factory = RequestFactory()
+    
+    def make_request(self, user, method='get'):
+        """Build a request for user that has been through ClaraAuthContextMiddleware."""
+        request = getattr(self.factory, method)('/')
+        request.user = user
+        ClaraAuthContextMiddleware(lambda request: HttpResponse())(request)
+        return request
+
+
+class ClaraAuthContextMiddlewareTestCase(PracticeContextTestCase):
+    """Test the per-request practice membership context"""
+    
+    def test_context_resolves_active_membership(self):
+        request = self.make_request(self.admin)
+        self.assertEqual(request.clara_context.membership.user_id, self.admin.id)
+        self.assertEqual(request.clara_context.membership.practice_id, self.practice.id)
+        self.assertEqual(request.clara_context.role, User.Role.ADMIN)
+    
+    def test_context_is_resolved_lazily_and_once(self):
+        with self.assertNumQueries(0):
+            request = self.make_request(self.admin)
+        
+        with self.assertNumQueries(1):
+            request.clara_context.role
+            request.clara_context.membership
+            get_active_membership(request)
+    
+    def test_context_resolves_after_user_is_set(self):
+        request = self.factory.get('/')
+        request.user = AnonymousUser()
+        ClaraAuthContextMiddleware(lambda request: HttpResponse())(request)
+        
+        # DRF sets the user inside the view, after the middleware has run
+        request.user = self.billing
+        self.assertEqual(request.clara_context.role, User.Role.BILLING)
+    
+    def test_anonymous_user_has_no_membership(self):
+        request = self.make_request(AnonymousUser())
+        with self.assertNumQueries(0):
+            self.assertIsNone(request.clara_context.membership)
+            self.assertIsNone(request.clara_context.role)
+    
+    def test_user_without_active_practice_has_no_membership(self):
+        user = User.objects.create_user(username="no_practice", password="SecurePass123!")
+        request = self.make_request(user)
+        self.assertIsNone(request.clara_context.membership)
+    
+    def test_inactive_membership_is_ignored(self):
+        PracticeMembership.objects.filter(user=self.admin).update(is_active=False)
+        request = self.make_request(self.admin)
+        self.assertIsNone(request.clara_context.membership)
+    
+    def test_membership_in_other_practice_is_ignored(self):
+        self.admin.active_practice = self.other_practice
+        request = self.make_request(self.admin)
+        self.assertIsNone(request.clara_context.membership)
+    
+    def test_membership_is_loaded_without_middleware(self):
+        request = self.factory.get('/')
+        request.user = self.admin
+        self.assertEqual(get_active_membership(request).role, User.Role.ADMIN)
+
+
+class PermissionTestCase(PracticeContextTestCase):
+    """Test the role-based permission classes"""
+    
+    def assertAllowed(self, permission, user, method='get'):
+        request = self.make_request(user, method)
+        self.assertTrue(permission().has_permission(request, None))
+    
+    def assertDenied(self, permission, user, method='get'):
+        request = self.make_request(user, method)
+        self.assertFalse(permission().has_permission(request, None))
+    
+    def test_permissions_deny_anonymous_users(self):
+        for permission in [
+            IsPracticeMember, IsPracticeAdmin, IsPracticeOwner, IsTherapist,
+            IsBillingStaff, CanSubmitClaims, ReadOnlyOrAdmin,
+        ]:
+            with self.subTest(permission=permission.__name__):
+                self.assertDenied(permission, AnonymousUser())
+    
+    def test_is_practice_member(self):
+        self.assertAllowed(IsPracticeMember, self.front_desk)
+        
+        PracticeMembership.objects.filter(user=self.front_desk).update(is_active=False)
+        self.assertDenied(IsPracticeMember, self.front_desk)
+    
+    def test_is_practice_member_object_permission(self):
+        request = self.make_request(self.admin)
+        permission = IsPracticeMember()
+        self.assertTrue(permission.has_object_permission(request, None, self.therapist))
+        
+        other_therapist = Therapist(practice=self.other_practice)
+        self.assertFalse(permission.has_object_permission(request, None, other_therapist))
+    
+    def test_is_practice_admin(self):
+        self.assertAllowed(IsPracticeAdmin, self.admin)
+        self.assertDenied(IsPracticeAdmin, self.billing)
+        self.assertDenied(IsPracticeAdmin, self.therapist_user)
+    
+    def test_is_practice_owner(self):
+        self.assertAllowed(IsPracticeOwner, self.admin)
+        self.assertDenied(IsPracticeOwner, self.billing)
+    
+    def test_is_therapist(self):
+        self.assertAllowed(IsTherapist, self.therapist_user)
+        self.assertDenied(IsTherapist, self.admin)
+    
+    def test_is_therapist_object_permission(self):
+        request = self.make_request(self.therapist_user)
+        permission = IsTherapist()
+        own_session = Session(therapist_id=self.therapist.id)
+        other_session = Session(therapist_id=uuid.uuid4())
+        
+        self.assertTrue(permission.has_object_permission(request, None, own_session))
+        self.assertFalse(permission.has_object_permission(request, None, other_session))
+    
+    def test_is_billing_staff(self):
+        self.assertAllowed(IsBillingStaff, self.billing)
+        self.assertAllowed(IsBillingStaff, self.admin)
+        self.assertDenied(IsBillingStaff, self.therapist_user)
+        self.assertDenied(IsBillingStaff, self.front_desk)
+    
+    def test_can_submit_claims(self):
+        self.assertAllowed(CanSubmitClaims, self.therapist_user)
+        self.assertAllowed(CanSubmitClaims, self.billing)
+        self.assertAllowed(CanSubmitClaims, self.admin)
+        self.assertDenied(CanSubmitClaims, self.front_desk)
+    
+    def test_read_only_or_admin(self):
+        self.assertAllowed(ReadOnlyOrAdmin, self.front_desk, 'get')
+        self.assertDenied(ReadOnlyOrAdmin, self.front_desk, 'post')
+        self.assertAllowed(ReadOnlyOrAdmin, self.admin, 'post')
+    
+    def test_permissions_share_one_membership_lookup(self):
+        request = self.make_request(self.admin)
+        with self.assertNumQueries(1):
+            for permission in [IsPracticeMember, IsPracticeAdmin, IsBillingStaff, ReadOnlyOrAdmin]:
+                self.assertTrue(permission().has_permission(request, None))
+
+
+@override_settings(ROOT_URLCONF='config.urls')
+class PracticeMembersAccessTestCase(PracticeContextTestCase):
+    """Test that membership changes take effect on the next request"""
+    
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+    
+    def test_admin_can_list_members(self):
+        response = self.client.get('/api/v1/auth/practice-members/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['total'], 4)
+    
+    def test_members_list_query_count(self):
+        # Membership, members with user and therapist joined in, practice name
+        self.client.force_authenticate(user=User.objects.get(pk=self.admin.pk))
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/v1/auth/practice-members/')
+        self.assertEqual(response.status_code, 200)
+    
+    def test_deactivated_admin_is_denied_immediately(self):
+        self.assertEqual(self.client.get('/api/v1/auth/practice-members/').status_code, 200)
+        
+        PracticeMembership.objects.filter(user=self.admin).update(is_active=False)
+        self.assertEqual(self.client.get('/api/v1/auth/practice-members/').status_code, 403)
+    
+    def test_demoted_admin_is_denied_immediately(self):
+        self.assertEqual(self.client.get('/api/v1/auth/practice-members/').status_code, 200)
+        
+        PracticeMembership.objects.filter(user=self.admin).update(role=User.Role.BILLING)
+        self.assertEqual(self.client.get('/api/v1/auth/practice-members/').status_code, 403)
+
+
+class TokenCacheTestCase(TestCase):
+    """Test that cached token lookups are dropped when they go stale"""
+    
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="cached", password="SecurePass123!")
+        self.token = Token.objects.create(user=self.user)
+        CachedTokenAuthentication().authenticate_credentials(self.token.key)
+    
+    def test_user_save_drops_cached_token(self):
+        self.assertIsNotNone(cache.get(token_cache_key(self.token.key)))
+        
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(cache.get(token_cache_key(self.token.key)))
+    
+    def test_token_delete_drops_cached_token(self):
+        self.token.delete()
+        self.assertIsNone(cache.get(token_cache_key(self.token.key)))
+    
+    def test_token_cache_follows_authentication_setting(self):
+        self.assertTrue(token_cache_enabled())
+        
+        with override_settings(REST_FRAMEWORK={
+            'DEFAULT_AUTHENTICATION_CLASSES': [
+                'rest_framework.authentication.TokenAuthentication',
+            ],
+        }):
+            self.assertFalse(token_cache_enabled())
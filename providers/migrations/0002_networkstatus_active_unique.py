@@ -0,0 +1,24 @@
+# Generated by Django 4.2.7 on 2026-10-16 02:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("providers", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="networkstatus",
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name="networkstatus",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("is_active", True)),
+                fields=("therapist", "payer_name"),
+                name="net_active_therapist_payer_uq",
+            ),
+        ),
+    ]
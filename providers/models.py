@@ -5,6 +5,7 @@ Simple placeholder for future provider network management.
 Demonstrates awareness of provider credentialing needs without over-engineering.
 """
 from django.db import models
+from django.db.models import Q
 from claims.models import BaseModel, Practice, Therapist
 
 
@@ -37,7 +38,14 @@ class NetworkStatus(BaseModel):
     # Future: Will add contract tracking
     
     class Meta:
-        unique_together = [['therapist', 'payer_name']]
+        # Only one active entry per payer; inactive rows are kept as history
+        constraints = [
+            models.UniqueConstraint(
+                fields=['therapist', 'payer_name'],
+                condition=Q(is_active=True),
+                name='net_active_therapist_payer_uq'
+            )
+        ]
     
     def __str__(self):
         return f"{self.therapist} - {self.payer_name} ({'In' if self.is_in_network else 'Out'} Network)"
\ No newline at end of file
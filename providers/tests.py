@@ -0,0 +1,63 @@
+"""
+Provider Network Tests
+"""
+from django.db import IntegrityError, transaction
+from django.test import TestCase
+
+from claims.models import Practice, Therapist
+from providers.models import NetworkStatus
+
+
+class NetworkStatusConstraintTestCase(TestCase):
+    """Test the one-active-entry-per-payer constraint"""
+    
+    def setUp(self):
+        self.practice = Practice.objects.create(
+            name="Test Practice",
+            npi="1234567890",
+            tax_id="12-3456789",
+            address_line1="123 Main St",
+            city="Boston",
+            state="MA",
+            zip_code="02101"
+        )
+        self.therapist = Therapist.objects.create(
+            practice=self.practice,
+            first_name="Jane",
+            last_name="Smith",
+            npi="0987654321",
+            license_number="PSY12345",
+            license_state="MA"
+        )
+    
+    def create_status(self, is_active):
+        return NetworkStatus.objects.create(
+            practice=self.practice,
+            therapist=self.therapist,
+            payer_name="Blue Cross",
+            is_in_network=True,
+            provider_id="BC-001",
+            is_active=is_active
+        )
+    
+    def test_inactive_history_rows_allowed(self):
+        self.create_status(is_active=False)
+        self.create_status(is_active=False)
+        self.create_status(is_active=True)
+        
+        self.assertEqual(
+            NetworkStatus.objects.filter(therapist=self.therapist, payer_name="Blue Cross").count(),
+            3
+        )
+    
+    def test_second_active_row_rejected(self):
+        self.create_status(is_active=True)
+        
+        with self.assertRaises(IntegrityError):
+            with transaction.atomic():
+                self.create_status(is_active=True)
+        
+        self.assertEqual(
+            NetworkStatus.objects.filter(therapist=self.therapist, is_active=True).count(),
+            1
+        )
@@ -1,80 +1,100 @@
 #!/usr/bin/env python3
 """
 Test script to verify all APIs are working correctly.
+
+Collected by pytest against a running server; the ``session`` fixture in
+conftest.py supplies a shared requests.Session. Run in parallel with:
+
+    pytest -n 4 test_apis.py
 """
 
 import json
-import requests
+import pytest
 from datetime import datetime, date, timedelta
 
 BASE_URL = "http://localhost:8000"
 
+# Documentation markers all appear in the first couple of KB of each page,
+# so only that much is read off the wire.
+DOCS_HEAD_BYTES = 2048
+
+
+def fetch_head(session, url, size=DOCS_HEAD_BYTES):
+    """Stream a GET and return only the first ``size`` bytes as text."""
+    with session.get(url, stream=True) as response:
+        response.raise_for_status()
+        chunk = next(response.iter_content(size), b"")
+    return chunk.decode(errors="ignore")
 
-def test_health_check():
+
+def test_health_check(session):
     """Test health check endpoint."""
     print("Testing Health Check...")
-    response = requests.get(f"{BASE_URL}/api/v1/claims/health")
+    response = session.get(f"{BASE_URL}/api/v1/claims/health")
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "healthy"
     print("✅ Health check passed")
-    return True
 
 
-def test_claim_preparation():
-    """Test claim preparation API."""
-    print("\nTesting Claim Preparation...")
-    
-    # Test valid claim
-    claim_data = {
-        "practice_id": "practice_001",
-        "therapist_id": "therapist_001",
-        "patient_id": "patient_001",
-        "session_date": "2024-01-20",
-        "cpt_code": "90834",
-        "icd10_code": "F41.1",
-        "fee": 150.00,
-        "copay": 25.00,
-        "payer_id": "BCBS001"
-    }
-    
-    response = requests.post(
+VALID_CLAIM = {
+    "practice_id": "practice_001",
+    "therapist_id": "therapist_001",
+    "patient_id": "patient_001",
+    "session_date": "2024-01-20",
+    "cpt_code": "90834",
+    "icd10_code": "F41.1",
+    "fee": 150.00,
+    "copay": 25.00,
+    "payer_id": "BCBS001"
+}
+
+
+def prepare_claim(session, claim_data):
+    """POST a claim payload to the preparation endpoint."""
+    return session.post(
         f"{BASE_URL}/api/v1/claims/prepare",
         json=claim_data,
         headers={"Content-Type": "application/json"}
     )
+
+
+def test_claim_preparation(session):
+    """Test claim preparation API with a valid claim."""
+    print("\nTesting Claim Preparation...")
+    
+    response = prepare_claim(session, VALID_CLAIM)
     
     assert response.status_code == 200
     data = response.json()
     assert data["status"] == "READY_FOR_SUBMISSION"
     assert data["charge_amount"] == 150.0
     print(f"✅ Valid claim prepared: {data['claim_id']}")
-    
-    # Test invalid claim (negative fee)
-    invalid_claim = claim_data.copy()
-    invalid_claim["fee"] = -100
-    
-    response = requests.post(
-        f"{BASE_URL}/api/v1/claims/prepare",
-        json=invalid_claim,
-        headers={"Content-Type": "application/json"}
-    )
-    
-    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("field, value", [
+    ("fee", -100),
+    ("cpt_code", "INVALID"),
+    ("session_date", (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")),
+], ids=["negative-fee", "invalid-cpt", "future-date"])
+def test_invalid_claim_rejected(session, field, value):
+    """Test that claims breaking a business rule are rejected."""
+    invalid_claim = {**VALID_CLAIM, field: value}
+    
+    response = prepare_claim(session, invalid_claim)
+    
+    assert response.status_code == 422, response.text
     data = response.json()
     assert data["status"] == "INVALID"
     assert len(data["validation_errors"]) > 0
-    print(f"✅ Invalid claim rejected: {data['validation_errors'][0]}")
+    print(f"✅ Invalid {field} rejected: {data['validation_errors'][0]}")
+
+
+def test_high_copay(session):
+    """Test claim with copay exceeding fee."""
+    invalid_claim = {**VALID_CLAIM, "copay": 200.00}
     
-    # Test claim with copay exceeding fee
-    invalid_claim = claim_data.copy()
-    invalid_claim["copay"] = 200.00
-    
-    response = requests.post(
-        f"{BASE_URL}/api/v1/claims/prepare",
-        json=invalid_claim,
-        headers={"Content-Type": "application/json"}
-    )
+    response = prepare_claim(session, invalid_claim)
     
     # Note: Currently this returns 200 with copay set to 0 (business logic)
     # In a production system, this might be handled differently
@@ -85,105 +105,30 @@ def test_claim_preparation():
         print(f"✅ High copay rejected: {data['validation_errors'][0]}")
     else:
         print(f"✅ High copay handled: copay adjusted to {data.get('copay_amount', 0)}")
-    
-    # Test invalid CPT code
-    invalid_claim = claim_data.copy()
-    invalid_claim["cpt_code"] = "INVALID"
-    
-    response = requests.post(
-        f"{BASE_URL}/api/v1/claims/prepare",
-        json=invalid_claim,
-        headers={"Content-Type": "application/json"}
-    )
-    
-    assert response.status_code == 422
-    data = response.json()
-    assert data["status"] == "INVALID"
-    print(f"✅ Invalid CPT code rejected: {data['validation_errors'][0]}")
-    
-    # Test future date
-    invalid_claim = claim_data.copy()
-    future_date = (datetime.now() + timedelta(days=30)).strftime("%Y-%m-%d")
-    invalid_claim["session_date"] = future_date
-    
-    response = requests.post(
-        f"{BASE_URL}/api/v1/claims/prepare",
-        json=invalid_claim,
-        headers={"Content-Type": "application/json"}
-    )
-    
-    assert response.status_code == 422
-    data = response.json()
-    assert data["status"] == "INVALID"
-    print(f"✅ Future date rejected: {data['validation_errors'][0]}")
-    
-    return True
 
 
-def test_api_documentation():
+def test_api_documentation(session):
     """Test that API documentation is accessible."""
     print("\nTesting API Documentation...")
     
     # Test Swagger UI
-    response = requests.get(f"{BASE_URL}/api/docs/")
-    assert response.status_code == 200
-    assert "swagger-ui" in response.text
+    head = fetch_head(session, f"{BASE_URL}/api/docs/")
+    assert "swagger-ui" in head
     print("✅ Swagger UI accessible")
     
-    # Test OpenAPI schema
-    response = requests.get(f"{BASE_URL}/api/schema/")
-    assert response.status_code == 200
-    # The schema endpoint returns YAML by default, not JSON
-    content = response.text
-    assert "openapi" in content
-    assert "Clara Claims API" in content
+    # Test OpenAPI schema - JSON puts the "openapi" key and info block first
+    head = fetch_head(session, f"{BASE_URL}/api/schema/?format=json")
+    assert '"openapi"' in head
+    assert "Clara Claims API" in head
     print(f"✅ OpenAPI schema accessible")
     
     # Test ReDoc
-    response = requests.get(f"{BASE_URL}/api/redoc/")
-    assert response.status_code == 200
-    assert "redoc" in response.text.lower()
+    head = fetch_head(session, f"{BASE_URL}/api/redoc/")
+    assert "redoc" in head.lower()
     print("✅ ReDoc accessible")
-    
-    return True
-
 
-def main():
-    """Run all tests."""
-    print("="*60)
-    print("CLARA HEALTHCARE API TEST SUITE")
-    print("="*60)
-    
-    tests = [
-        test_health_check,
-        test_claim_preparation,
-        test_api_documentation,
-    ]
-    
-    passed = 0
-    failed = 0
-    
-    for test in tests:
-        try:
-            if test():
-                passed += 1
-        except Exception as e:
-            print(f"❌ {test.__name__} failed: {str(e)}")
-            failed += 1
-    
-    print("\n" + "="*60)
-    print(f"TEST RESULTS: {passed} passed, {failed} failed")
-    print("="*60)
-    
-    if failed == 0:
-        print("✅ ALL TESTS PASSED!")
-    else:
-        print(f"⚠️  {failed} test(s) failed")
-    
-    return failed == 0
 
 
 if __name__ == "__main__":
     import sys
-    success = main()
-    sys.exit(0 if success else 1)
\ No newline at end of file
+    sys.exit(pytest.main([__file__]))
\ No newline at end of file
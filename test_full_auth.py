@@ -1,46 +1,39 @@
 #!/usr/bin/env python3
 """
 Comprehensive test of all authentication endpoints
+
+Requests are dispatched in-process through Django's test Client rather
+than over HTTP to a running server.
 """
+import os
 import json
-import requests
+import pytest
 from datetime import datetime
 
-BASE_URL = "http://localhost:8000"
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.test import Client
 
-def test_auth_flow():
+client = Client()
+
+
+@pytest.mark.django_db
+@pytest.mark.urls('config.urls')
+def test_auth_flow(registered_practice):
     """Test complete authentication flow."""
     print("="*60)
     print("CLARA HEALTHCARE - AUTHENTICATION SYSTEM TEST")
     print("="*60)
     
-    # 1. Register first practice
+    # 1. Practice registered once per session by the conftest fixture
     print("\n1. REGISTER PRACTICE")
     print("-" * 40)
     
     timestamp = datetime.now().strftime("%H%M%S")
-    practice_data = {
-        "practice_name": f"Test Practice {timestamp}",
-        "tax_id": f"99-{timestamp}",
-        "npi": f"11{timestamp[:8]}",
-        "address": "123 Test Street",
-        "city": "San Francisco",
-        "state": "CA",
-        "zip_code": "94102",
-        "username": f"admin_{timestamp}",
-        "email": f"admin_{timestamp}@test.com",
-        "password": "TestPass123!",
-        "first_name": "Test",
-        "last_name": "Admin"
-    }
-    
-    response = requests.post(
-        f"{BASE_URL}/api/v1/auth/register-practice/",
-        json=practice_data
-    )
-    
-    assert response.status_code == 201, f"Registration failed: {response.text}"
-    data = response.json()
+    data = registered_practice
     token1 = data['token']
     practice1_id = data['practice']['id']
     user1_id = data['user']['id']
@@ -54,16 +47,17 @@ def test_auth_flow():
     print("-" * 40)
     
     login_data = {
-        "username": practice_data["username"],
-        "password": practice_data["password"]
+        "username": registered_practice["user"]["username"],
+        "password": registered_practice["password"]
     }
     
-    response = requests.post(
-        f"{BASE_URL}/api/v1/auth/login/",
-        json=login_data
+    response = client.post(
+        "/api/v1/auth/login/",
+        login_data,
+        content_type="application/json"
     )
     
-    assert response.status_code == 200, f"Login failed: {response.text}"
+    assert response.status_code == 200, f"Login failed: {response.content.decode()}"
     data = response.json()
     assert data['token'] == token1, "Token mismatch"
     print(f"✅ Login successful")
@@ -73,13 +67,13 @@ def test_auth_flow():
     print("\n3. USER PROFILE")
     print("-" * 40)
     
-    headers = {"Authorization": f"Token {token1}"}
-    response = requests.get(
-        f"{BASE_URL}/api/v1/auth/profile/",
-        headers=headers
+    headers = {"HTTP_AUTHORIZATION": f"Token {token1}"}
+    response = client.get(
+        "/api/v1/auth/profile/",
+        **headers
     )
     
-    assert response.status_code == 200, f"Profile fetch failed: {response.text}"
+    assert response.status_code == 200, f"Profile fetch failed: {response.content.decode()}"
     profile = response.json()
     print(f"✅ User: {profile['first_name']} {profile['last_name']}")
     print(f"✅ Role: {profile['role']}")
@@ -95,13 +89,14 @@ def test_auth_flow():
         "message": "Welcome to our practice!"
     }
     
-    response = requests.post(
-        f"{BASE_URL}/api/v1/auth/invitations/",
-        json=invitation_data,
-        headers=headers
+    response = client.post(
+        "/api/v1/auth/invitations/",
+        invitation_data,
+        content_type="application/json",
+        **headers
     )
     
-    assert response.status_code == 201, f"Invitation failed: {response.text}"
+    assert response.status_code == 201, f"Invitation failed: {response.content.decode()}"
     invitation = response.json()
     invitation_token = invitation['invitation']['token']
     print(f"✅ Invitation sent to: {invitation['invitation']['email']}")
@@ -120,12 +115,13 @@ def test_auth_flow():
         "last_name": "Therapist"
     }
     
-    response = requests.post(
-        f"{BASE_URL}/api/v1/auth/invitations/accept/",
-        json=accept_data
+    response = client.post(
+        "/api/v1/auth/invitations/accept/",
+        accept_data,
+        content_type="application/json"
     )
     
-    assert response.status_code == 200, f"Accept failed: {response.text}"
+    assert response.status_code == 200, f"Accept failed: {response.content.decode()}"
     data = response.json()
     therapist_token = data['token']
     print(f"✅ Therapist joined: {data['user']['username']}")
@@ -135,12 +131,12 @@ def test_auth_flow():
     print("\n6. PRACTICE MEMBERS")
     print("-" * 40)
     
-    response = requests.get(
-        f"{BASE_URL}/api/v1/auth/practice-members/",
-        headers=headers  # Admin token
+    response = client.get(
+        "/api/v1/auth/practice-members/",
+        **headers  # Admin token
     )
     
-    assert response.status_code == 200, f"Members fetch failed: {response.text}"
+    assert response.status_code == 200, f"Members fetch failed: {response.content.decode()}"
     members_data = response.json()
     print(f"✅ Practice: {members_data['practice']['name']}")
     print(f"✅ Total members: {members_data['total']}")
@@ -151,12 +147,12 @@ def test_auth_flow():
     print("\n7. LOGOUT")
     print("-" * 40)
     
-    response = requests.post(
-        f"{BASE_URL}/api/v1/auth/logout/",
-        headers=headers
+    response = client.post(
+        "/api/v1/auth/logout/",
+        **headers
     )
     
-    assert response.status_code == 200, f"Logout failed: {response.text}"
+    assert response.status_code == 200, f"Logout failed: {response.content.decode()}"
     print("✅ Logout successful")
     
     # 8. Test protected endpoint with therapist token
@@ -176,12 +172,13 @@ def test_auth_flow():
     }
     
     # Without auth (should work since claims endpoint doesn't require auth yet)
-    response = requests.post(
-        f"{BASE_URL}/api/v1/claims/prepare",
-        json=claim_data
+    response = client.post(
+        "/api/v1/claims/prepare",
+        claim_data,
+        content_type="application/json"
     )
     
-    assert response.status_code == 200, f"Claim preparation failed: {response.text}"
+    assert response.status_code == 200, f"Claim preparation failed: {response.content.decode()}"
     claim = response.json()
     print(f"✅ Claim prepared: {claim['claim_id']}")
     print(f"✅ Status: {claim['status']}")
@@ -201,4 +198,7 @@ def test_auth_flow():
     print("\nView API docs at: http://localhost:8000/api/docs/")
 
 if __name__ == "__main__":
-    test_auth_flow()
\ No newline at end of file
+    from django.test.utils import setup_test_environment
+    from healthcare.testing import register_practice
+    setup_test_environment()
+    test_auth_flow(register_practice(client))
\ No newline at end of file
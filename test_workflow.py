@@ -4,37 +4,91 @@ Clara Healthcare Backend - Comprehensive Workflow Test Script
 
 Tests the complete user journey from registration to claim processing.
 Demonstrates both successful and failure scenarios for API validation.
+
+Run as a script for the full sequential walkthrough, or under pytest to
+run each stage as an independent test. WorkflowTest seeds its data once
+in setUpTestData, and --dist=loadscope keeps the class on one worker so
+that only happens once per run:
+
+    pytest -n auto --dist=loadscope --reuse-db test_workflow.py
+
+Script runs make every API call in-process and roll the whole run back,
+so no server is needed and nothing is left in the configured database.
+Set WORKFLOW_IN_MEMORY_DB=1 to skip that database and run against a
+throwaway in-memory one instead:
+
+    WORKFLOW_IN_MEMORY_DB=1 python test_workflow.py
 """
+import argparse
+import functools
+import io
 import os
 import sys
 import json
+import re
 import uuid
 import random
+from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from decimal import Decimal
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 # Add project to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'healthcare.settings')
 
+# Only for script runs; pytest manages its own test database
+IN_MEMORY_DB = __name__ == '__main__' and os.environ.get('WORKFLOW_IN_MEMORY_DB') == '1'
+
 import django
+from django.conf import settings
+
+if IN_MEMORY_DB:
+    settings.DATABASES['default'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': ':memory:',
+    }
+
 django.setup()
 
-from django.contrib.auth.models import User
-from django.test import Client
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.test import TestCase, override_settings
+from django.test.utils import setup_test_environment
 from rest_framework.test import APIClient
 from rest_framework.authtoken.models import Token
 
+from healthcare.auth_models import PracticeMembership
 from claims.models import Practice, Therapist, Patient, Session, Claim
-from members.models import InsurancePlan, MemberCoverage
-from providers.models import ProviderNetwork, NetworkParticipation
+from members.models import InsuranceCoverage
+from providers.models import NetworkStatus
+from analytics.models import PracticeSummary
+
+User = get_user_model()
 
 # Test configuration
-BASE_URL = "http://localhost:8000"
 API_PREFIX = "/api/v1"
 
+# URLconf serving the API_PREFIX routes to the in-process client
+API_URLCONF = 'config.urls'
+
+# Read from every rate-limit probe response
+RATE_LIMIT_HEADER = 'X-RateLimit-Remaining'
+
+# Session generation choices
+CPT_CODES = ('90837', '90834', '90832')  # 60, 45, 30 minute sessions
+ICD10_CODES = ('F33.1', 'F41.1', 'F43.10')  # Depression, Anxiety, PTSD
+FEE_CHOICES = (Decimal("150.00"), Decimal("175.00"), Decimal("200.00"))
+COPAY_CHOICES = (Decimal("0.00"), Decimal("25.00"), Decimal("30.00"), Decimal("40.00"))
+
+# Payer name and specialist copay per payer id
+PAYERS = {
+    'BCBSMA': ("Blue Cross Blue Shield MA", Decimal("30.00")),
+    'AETNA': ("Aetna", Decimal("40.00")),
+}
+
 # Color codes for output
 class Colors:
     HEADER = '\033[95m'
@@ -48,183 +102,215 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 
+# Escape codes are only worth emitting to a terminal
+USE_COLOR = sys.stdout.isatty()
+
+
+def _template(prefix: str, *codes: str) -> str:
+    """Build a format template for '{msg}', wrapped in the given color codes."""
+    if not USE_COLOR:
+        return prefix + '{msg}'
+    return ''.join(codes) + prefix + '{msg}' + Colors.ENDC
+
+
+# Output templates, built once at import
+_HEADER_FMT = _template('', Colors.HEADER, Colors.BOLD)
+_RULE = _HEADER_FMT.format(msg='=' * 60)
+_STEP_FMT = '\n' + _template('▶ ', Colors.OKBLUE)
+_OK_FMT = _template('✓ ', Colors.OKGREEN)
+_FAIL_FMT = _template('✗ ', Colors.FAIL)
+_WARN_FMT = _template('⚠ ', Colors.WARNING)
+_INFO_FMT = _template('ℹ ', Colors.OKCYAN)
+_ENDPOINT_FMT = '\n' + _template('', Colors.OKBLUE)
+_PASSED_FMT = '\n' + _template('', Colors.OKGREEN, Colors.BOLD)
+_FAILED_FMT = '\n' + _template('', Colors.FAIL, Colors.BOLD)
+
+
 class WorkflowTester:
     """Comprehensive workflow tester for Clara Healthcare Backend."""
     
-    def __init__(self):
+    def __init__(self, verbose: bool = False):
+        self.verbose = verbose
+        # Output is collected here and written out once per step
+        self._buf = io.StringIO()
+        # Requests are handled in-process, inside the caller's transaction;
+        # there is no connection to keep alive
         self.client = APIClient()
         self.users = {}
         self.tokens = {}
+        # Authorization header per role, built once the tokens exist, and
+        # passed per request so the client holds no credentials
+        self.auth_headers = {}
         self.practice = None
         self.therapists = []
         self.patients = []
         self.sessions = []
         self.claims = []
+        self._therapist_ids = []
+        self._patient_ids = []
+        self._patient_payers = []
         
+    def write(self, text: str):
+        """Buffer a line of output until the next flush."""
+        self._buf.write(text + "\n")
+    
+    def flush_output(self):
+        """Write buffered output to stdout in a single call."""
+        sys.stdout.write(self._buf.getvalue())
+        sys.stdout.flush()
+        self._buf.seek(0)
+        self._buf.truncate(0)
+    
     def print_header(self, text: str):
         """Print a formatted header."""
-        print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}")
-        print(f"{Colors.HEADER}{Colors.BOLD}{text}{Colors.ENDC}")
-        print(f"{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}")
+        self.write('\n' + _RULE)
+        self.write(_HEADER_FMT.format(msg=text))
+        self.write(_RULE)
     
     def print_step(self, text: str):
         """Print a step description."""
-        print(f"\n{Colors.OKBLUE}▶ {text}{Colors.ENDC}")
+        self.write(_STEP_FMT.format(msg=text))
     
     def print_success(self, text: str):
         """Print success message."""
-        print(f"{Colors.OKGREEN}✓ {text}{Colors.ENDC}")
+        self.write(_OK_FMT.format(msg=text))
     
     def print_failure(self, text: str):
         """Print failure message."""
-        print(f"{Colors.FAIL}✗ {text}{Colors.ENDC}")
+        self.write(_FAIL_FMT.format(msg=text))
     
     def print_warning(self, text: str):
         """Print warning message."""
-        print(f"{Colors.WARNING}⚠ {text}{Colors.ENDC}")
+        self.write(_WARN_FMT.format(msg=text))
     
     def print_info(self, text: str, data: Any = None):
-        """Print info message."""
-        print(f"{Colors.OKCYAN}ℹ {text}{Colors.ENDC}")
-        if data:
-            print(json.dumps(data, indent=2, default=str))
+        """Print info message, with the data dump only in verbose mode."""
+        self.write(_INFO_FMT.format(msg=text))
+        if data and self.verbose:
+            self.write(json.dumps(data, indent=2, default=str))
     
     def run_all_tests(self):
-        """Run complete workflow test suite."""
+        """
+        Run complete workflow test suite.
+        
+        Every step runs in one transaction that is rolled back at the end,
+        each in its own savepoint, so nothing is committed and there is
+        nothing to delete afterwards. The API calls are handled in-process
+        on the same connection, so they see the uncommitted rows.
+        """
         self.print_header("CLARA HEALTHCARE BACKEND - WORKFLOW TEST SUITE")
         
-        try:
+        steps = [
             # 1. Setup and Registration
-            self.test_user_registration()
-            self.test_practice_setup()
+            self.test_user_registration,
+            self.test_practice_setup,
             
             # 2. Provider Network Setup
-            self.test_provider_network_setup()
+            self.test_provider_network_setup,
             
             # 3. Patient and Coverage Setup
-            self.test_patient_registration()
-            self.test_insurance_coverage_setup()
+            self.test_patient_registration,
+            self.test_insurance_coverage_setup,
             
             # 4. Session Management
-            self.test_session_creation()
+            self.test_session_creation,
             
             # 5. Claims Processing
-            self.test_claim_preparation_success()
-            self.test_claim_preparation_failures()
+            self.test_claim_preparation_success,
+            self.test_claim_preparation_failures,
             
             # 6. Eligibility Verification
-            self.test_eligibility_check()
+            self.test_eligibility_check,
             
             # 7. Analytics and Reporting
-            self.test_analytics_access()
+            self.test_analytics_access,
             
             # 8. Multi-Tenant Isolation
-            self.test_tenant_isolation()
+            self.test_tenant_isolation,
             
             # 9. Permission Testing
-            self.test_role_based_permissions()
+            self.test_role_based_permissions,
             
             # 10. Rate Limiting
-            self.test_rate_limiting()
+            self.test_rate_limiting,
+        ]
+        
+        try:
+            with transaction.atomic():
+                try:
+                    for step in steps:
+                        with transaction.atomic():
+                            step()
+                        self.flush_output()
+                finally:
+                    transaction.set_rollback(True)
             
             self.print_header("ALL TESTS COMPLETED SUCCESSFULLY!")
             
         except Exception as e:
             self.print_failure(f"Test suite failed: {str(e)}")
             raise
+        finally:
+            self.flush_output()
     
     def test_user_registration(self):
         """Test user registration and API key generation."""
         self.print_step("Testing User Registration and API Key Generation")
         
-        # Register admin user
-        admin_data = {
-            'username': f'admin_{uuid.uuid4().hex[:8]}',
-            'email': 'admin@claratherapy.com',
-            'password': 'SecurePass123!',
-            'role': 'admin',
-            'first_name': 'Clara',
-            'last_name': 'Admin'
-        }
-        
-        admin_user = User.objects.create_user(
-            username=admin_data['username'],
-            email=admin_data['email'],
-            password=admin_data['password'],
-            first_name=admin_data['first_name'],
-            last_name=admin_data['last_name']
-        )
-        admin_user.role = 'admin'
-        admin_user.save()
-        
-        # Generate API token
-        token = Token.objects.create(user=admin_user)
-        self.users['admin'] = admin_user
-        self.tokens['admin'] = token.key
-        
-        self.print_success(f"Admin user registered: {admin_user.username}")
-        self.print_info(f"API Token generated: {token.key[:10]}...")
-        
-        # Register therapist user
-        therapist_data = {
-            'username': f'therapist_{uuid.uuid4().hex[:8]}',
-            'email': 'therapist@claratherapy.com',
-            'password': 'SecurePass123!',
-            'role': 'therapist',
-            'first_name': 'Jane',
-            'last_name': 'Smith'
-        }
-        
-        therapist_user = User.objects.create_user(
-            username=therapist_data['username'],
-            email=therapist_data['email'],
-            password=therapist_data['password'],
-            first_name=therapist_data['first_name'],
-            last_name=therapist_data['last_name']
-        )
-        therapist_user.role = 'therapist'
-        therapist_user.save()
-        
-        token = Token.objects.create(user=therapist_user)
-        self.users['therapist'] = therapist_user
-        self.tokens['therapist'] = token.key
-        
-        self.print_success(f"Therapist user registered: {therapist_user.username}")
-        
-        # Register billing staff
-        billing_data = {
-            'username': f'billing_{uuid.uuid4().hex[:8]}',
-            'email': 'billing@claratherapy.com',
-            'password': 'SecurePass123!',
-            'role': 'billing',
-            'first_name': 'Bill',
-            'last_name': 'Johnson'
-        }
-        
-        billing_user = User.objects.create_user(
-            username=billing_data['username'],
-            email=billing_data['email'],
-            password=billing_data['password'],
-            first_name=billing_data['first_name'],
-            last_name=billing_data['last_name']
-        )
-        billing_user.role = 'billing'
-        billing_user.save()
-        
-        token = Token.objects.create(user=billing_user)
-        self.users['billing'] = billing_user
-        self.tokens['billing'] = token.key
+        user_data = [
+            {
+                'username': f'admin_{uuid.uuid4().hex[:8]}',
+                'email': 'admin@claratherapy.com',
+                'role': 'admin',
+                'first_name': 'Clara',
+                'last_name': 'Admin'
+            },
+            {
+                'username': f'therapist_{uuid.uuid4().hex[:8]}',
+                'email': 'therapist@claratherapy.com',
+                'role': 'therapist',
+                'first_name': 'Jane',
+                'last_name': 'Smith'
+            },
+            {
+                'username': f'billing_{uuid.uuid4().hex[:8]}',
+                'email': 'billing@claratherapy.com',
+                'role': 'billing',
+                'first_name': 'Bill',
+                'last_name': 'Johnson'
+            }
+        ]
         
-        self.print_success(f"Billing staff registered: {billing_user.username}")
+        # Every user shares one password, so it is hashed once
+        password = make_password('SecurePass123!')
+        
+        # One INSERT for the users (with their roles) and one for the tokens
+        users = User.objects.bulk_create([
+            User(password=password, **data) for data in user_data
+        ])
+        tokens = Token.objects.bulk_create([
+            Token(user=user, key=Token.generate_key()) for user in users
+        ])
+        
+        for user, token in zip(users, tokens):
+            self.users[user.role] = user
+            self.tokens[user.role] = token.key
+            self.auth_headers[user.role] = {'HTTP_AUTHORIZATION': f'Token {token.key}'}
+        
+        self.print_success(f"Admin user registered: {self.users['admin'].username}")
+        self.print_info(f"API Token generated: {self.tokens['admin'][:10]}...")
+        self.print_success(f"Therapist user registered: {self.users['therapist'].username}")
+        self.print_success(f"Billing staff registered: {self.users['billing'].username}")
     
     def test_practice_setup(self):
         """Test practice creation and setup."""
         self.print_step("Setting up Practice (Multi-Tenant Root)")
         
-        # Create practice
+        # Create practice; a generated NPI keeps it from colliding with
+        # practices already in the database
         self.practice = Practice.objects.create(
             name="Clara Therapy Group",
-            npi="1234567890",
+            npi=str(uuid.uuid4().int)[:10],
             tax_id="12-3456789",
             address_line1="123 Wellness Way",
             city="Boston",
@@ -232,10 +318,12 @@ class WorkflowTester:
             zip_code="02115"
         )
         
-        # Associate users with practice
+        # Associate users with practice in one UPDATE
+        User.objects.filter(pk__in=[user.pk for user in self.users.values()]).update(
+            active_practice=self.practice
+        )
         for user in self.users.values():
-            user.practice = self.practice
-            user.save()
+            user.active_practice = self.practice
         
         self.print_success(f"Practice created: {self.practice.name}")
         
@@ -261,10 +349,20 @@ class WorkflowTester:
             email="john.doe@claratherapy.com"
         )
         self.therapists.append(therapist2)
+        self._therapist_ids = [therapist.id for therapist in self.therapists]
         
-        # Link therapist user to therapist model
-        self.users['therapist'].therapist = therapist1
-        self.users['therapist'].save()
+        # Give each user a membership in the practice, linking the
+        # therapist user to their therapist record
+        PracticeMembership.objects.bulk_create([
+            PracticeMembership(
+                user=user,
+                practice=self.practice,
+                role=role,
+                therapist=therapist1 if role == 'therapist' else None,
+                is_owner=role == 'admin'
+            )
+            for role, user in self.users.items()
+        ])
         
         self.print_success(f"Created {len(self.therapists)} therapists")
     
@@ -272,52 +370,18 @@ class WorkflowTester:
         """Test provider network and participation setup."""
         self.print_step("Setting up Provider Networks and Participation")
         
-        # Create insurance networks
-        bcbs_network = ProviderNetwork.objects.create(
-            payer_id="BCBSMA",
-            payer_name="Blue Cross Blue Shield MA",
-            network_code="BCBS_PPO",
-            network_name="BCBS PPO Network",
-            network_type="preferred",
-            reimbursement_multiplier=Decimal("1.10"),
-            effective_date=date.today() - timedelta(days=365)
-        )
-        
-        aetna_network = ProviderNetwork.objects.create(
-            payer_id="AETNA",
-            payer_name="Aetna",
-            network_code="AETNA_HMO",
-            network_name="Aetna HMO Network",
-            network_type="standard",
-            reimbursement_multiplier=Decimal("1.00"),
-            effective_date=date.today() - timedelta(days=365)
-        )
-        
-        self.print_success("Created insurance networks")
-        
-        # Create network participations
-        for therapist in self.therapists:
-            NetworkParticipation.objects.create(
+        # Enroll every therapist with every payer in one INSERT
+        NetworkStatus.objects.bulk_create([
+            NetworkStatus(
                 practice=self.practice,
                 therapist=therapist,
-                network=bcbs_network,
-                status='active',
-                application_date=date.today() - timedelta(days=180),
-                approval_date=date.today() - timedelta(days=150),
-                effective_date=date.today() - timedelta(days=150),
-                network_provider_id=f"BCBS_{therapist.npi}"
-            )
-            
-            NetworkParticipation.objects.create(
-                practice=self.practice,
-                therapist=therapist,
-                network=aetna_network,
-                status='active',
-                application_date=date.today() - timedelta(days=180),
-                approval_date=date.today() - timedelta(days=150),
-                effective_date=date.today() - timedelta(days=150),
-                network_provider_id=f"AETNA_{therapist.npi}"
+                payer_name=payer_name,
+                is_in_network=True,
+                provider_id=f"{payer_id}_{therapist.npi}"
             )
+            for therapist in self.therapists
+            for payer_id, (payer_name, _) in PAYERS.items()
+        ])
         
         self.print_success("Therapists enrolled in networks")
     
@@ -349,12 +413,14 @@ class WorkflowTester:
             }
         ]
         
-        for data in patient_data:
-            patient = Patient.objects.create(
-                practice=self.practice,
-                **data
-            )
-            self.patients.append(patient)
+        self.patients = Patient.objects.bulk_create([
+            Patient(practice=self.practice, **data)
+            for data in patient_data
+        ])
+        
+        # Parallel id/payer columns, sampled by index when creating sessions
+        self._patient_ids = [patient.id for patient in self.patients]
+        self._patient_payers = [patient.payer_id for patient in self.patients]
         
         self.print_success(f"Registered {len(self.patients)} patients")
     
@@ -362,56 +428,18 @@ class WorkflowTester:
         """Test insurance coverage setup."""
         self.print_step("Setting up Insurance Coverage")
         
-        # Create insurance plans
-        bcbs_plan = InsurancePlan.objects.create(
-            payer_id="BCBSMA",
-            payer_name="Blue Cross Blue Shield MA",
-            plan_code="PPO_GOLD",
-            plan_name="PPO Gold Plan",
-            plan_type="PPO",
-            mental_health_coverage=True,
-            annual_session_limit=52,
-            in_network_individual_deductible=Decimal("500.00"),
-            in_network_family_deductible=Decimal("1000.00"),
-            specialist_copay=Decimal("30.00"),
-            coinsurance_percentage=20,
-            effective_date=date.today() - timedelta(days=365)
-        )
-        
-        aetna_plan = InsurancePlan.objects.create(
-            payer_id="AETNA",
-            payer_name="Aetna",
-            plan_code="HMO_SILVER",
-            plan_name="HMO Silver Plan",
-            plan_type="HMO",
-            mental_health_coverage=True,
-            requires_referral=True,
-            annual_session_limit=40,
-            in_network_individual_deductible=Decimal("750.00"),
-            in_network_family_deductible=Decimal("1500.00"),
-            specialist_copay=Decimal("40.00"),
-            coinsurance_percentage=30,
-            effective_date=date.today() - timedelta(days=365)
-        )
-        
-        # Create member coverages
-        for patient in self.patients:
-            if patient.payer_id == "BCBSMA":
-                plan = bcbs_plan
-            else:
-                plan = aetna_plan
-            
-            MemberCoverage.objects.create(
+        # Create insurance coverages
+        InsuranceCoverage.objects.bulk_create([
+            InsuranceCoverage(
                 practice=self.practice,
                 patient=patient,
-                insurance_plan=plan,
+                payer_name=PAYERS[patient.payer_id][0],
                 member_id=patient.member_id,
                 group_number="GRP12345",
-                coverage_start_date=date.today() - timedelta(days=365),
-                status='active',
-                current_year_deductible_met=Decimal("250.00"),
-                current_year_sessions_used=10
+                copay_amount=PAYERS[patient.payer_id][1]
             )
+            for patient in self.patients
+        ])
         
         self.print_success("Insurance coverage configured for all patients")
     
@@ -419,26 +447,39 @@ class WorkflowTester:
         """Test session creation."""
         self.print_step("Creating Therapy Sessions")
         
-        cpt_codes = ['90837', '90834', '90832']  # 60, 45, 30 minute sessions
-        icd10_codes = ['F33.1', 'F41.1', 'F43.10']  # Depression, Anxiety, PTSD
-        
-        for i in range(10):
-            patient = random.choice(self.patients)
-            therapist = random.choice(self.therapists)
-            
-            session = Session.objects.create(
+        count = 10
+        today = date.today()
+        
+        # Draw each column for all rows at once instead of five calls per row.
+        # Patients and therapists are drawn as indices into the id columns,
+        # so rows reference them by id without touching model instances
+        patient_indices = random.choices(range(len(self._patient_ids)), k=count)
+        therapist_indices = random.choices(range(len(self._therapist_ids)), k=count)
+        day_offsets = random.choices(range(1, 31), k=count)
+        cpts = random.choices(CPT_CODES, k=count)
+        icd10s = random.choices(ICD10_CODES, k=count)
+        fees = random.choices(FEE_CHOICES, k=count)
+        copays = random.choices(COPAY_CHOICES, k=count)
+        
+        sessions = [
+            Session(
                 practice=self.practice,
-                therapist=therapist,
-                patient=patient,
-                session_date=date.today() - timedelta(days=random.randint(1, 30)),
-                cpt_code=random.choice(cpt_codes),
-                icd10_code=random.choice(icd10_codes),
-                fee=Decimal(random.choice(["150.00", "175.00", "200.00"])),
-                copay_collected=Decimal(random.choice(["0.00", "25.00", "30.00", "40.00"])),
-                payer_id=patient.payer_id,
+                therapist_id=self._therapist_ids[t],
+                patient_id=self._patient_ids[p],
+                session_date=today - timedelta(days=offset),
+                cpt_code=cpt_code,
+                icd10_code=icd10_code,
+                fee=fee,
+                copay_collected=copay,
+                payer_id=self._patient_payers[p],
                 status='completed'
             )
-            self.sessions.append(session)
+            for p, t, offset, cpt_code, icd10_code, fee, copay in zip(
+                patient_indices, therapist_indices, day_offsets, cpts, icd10s, fees, copays
+            )
+        ]
+        
+        self.sessions = Session.objects.bulk_create(sessions, batch_size=500)
         
         self.print_success(f"Created {len(self.sessions)} therapy sessions")
     
@@ -446,15 +487,12 @@ class WorkflowTester:
         """Test successful claim preparation."""
         self.print_step("Testing Successful Claim Preparation")
         
-        # Set authentication
-        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens["billing"]}')
-        
         # Prepare valid claim data
         session = self.sessions[0]
         claim_data = {
             'practice_id': str(self.practice.id),
-            'therapist_id': str(session.therapist.id),
-            'patient_id': str(session.patient.id),
+            'therapist_id': str(session.therapist_id),
+            'patient_id': str(session.patient_id),
             'session_date': str(session.session_date),
             'cpt_code': session.cpt_code,
             'icd10_code': session.icd10_code,
@@ -467,58 +505,67 @@ class WorkflowTester:
         response = self.client.post(
             f'{API_PREFIX}/claims/prepare',
             data=json.dumps(claim_data),
-            content_type='application/json'
+            content_type='application/json',
+            **self.auth_headers['billing']
         )
         
-        if response.status_code == 200:
-            self.print_success("Claim prepared successfully")
-            self.print_info("Claim details:", response.json())
-            
-            # Create actual claim record
-            claim = Claim.objects.create(
-                practice=self.practice,
-                session=session,
-                claim_number=response.json()['claim_id'],
-                payer_id=session.payer_id,
-                status='ready',
-                charge_amount=session.fee,
-                copay_amount=session.copay_collected
-            )
-            self.claims.append(claim)
-        else:
-            self.print_failure(f"Claim preparation failed: {response.status_code}")
-            self.print_info("Response:", response.json())
+        assert response.status_code == 200, f"Claim preparation failed: {response.content.decode()}"
+        prepared = response.json()
+        assert prepared['status'] == 'READY_FOR_SUBMISSION', prepared
+        assert prepared['validation_errors'] == [], prepared
+        assert prepared['cpt_code'] == session.cpt_code, prepared
+        assert prepared['charge_amount'] == float(session.fee), prepared
+        self.print_success("Claim prepared successfully")
+        self.print_info("Claim details:", prepared)
+        
+        # Create actual claim record
+        claim = Claim.objects.create(
+            practice=self.practice,
+            session=session,
+            claim_number=prepared['claim_id'],
+            payer_id=session.payer_id,
+            status='ready',
+            charge_amount=session.fee,
+            copay_amount=session.copay_collected
+        )
+        self.claims.append(claim)
     
     def test_claim_preparation_failures(self):
         """Test claim preparation with various failure scenarios."""
         self.print_step("Testing Claim Preparation Failure Scenarios")
         
-        # Set authentication
-        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens["billing"]}')
+        headers = self.auth_headers['billing']
+        
+        # Shared payload fields, formatted once for all scenarios
+        practice_id = str(self.practice.id)
+        therapist_id = str(self.therapists[0].id)
+        patient_id = str(self.patients[0].id)
+        today = str(date.today())
+        next_week = str(date.today() + timedelta(days=7))
         
         failure_scenarios = [
             {
                 'name': 'Copay exceeds fee',
                 'data': {
-                    'practice_id': str(self.practice.id),
-                    'therapist_id': str(self.therapists[0].id),
-                    'patient_id': str(self.patients[0].id),
-                    'session_date': str(date.today()),
+                    'practice_id': practice_id,
+                    'therapist_id': therapist_id,
+                    'patient_id': patient_id,
+                    'session_date': today,
                     'cpt_code': '90837',
                     'icd10_code': 'F33.1',
                     'fee': 175.00,
                     'copay_collected': 200.00,  # Exceeds fee
                     'payer_id': 'BCBSMA'
                 },
-                'expected_error': 'Copay cannot exceed'
+                'expected_error': 'cannot exceed total fee'
             },
             {
                 'name': 'Invalid CPT code',
                 'data': {
-                    'practice_id': str(self.practice.id),
-                    'therapist_id': str(self.therapists[0].id),
-                    'patient_id': str(self.patients[0].id),
-                    'session_date': str(date.today()),
+                    'practice_id': practice_id,
+                    'therapist_id': therapist_id,
+                    'patient_id': patient_id,
+                    'session_date': today,
                     'cpt_code': '99999',  # Invalid
                     'icd10_code': 'F33.1',
                     'fee': 175.00,
@@ -530,10 +577,10 @@ class WorkflowTester:
             {
                 'name': 'Zero fee',
                 'data': {
-                    'practice_id': str(self.practice.id),
-                    'therapist_id': str(self.therapists[0].id),
-                    'patient_id': str(self.patients[0].id),
-                    'session_date': str(date.today()),
+                    'practice_id': practice_id,
+                    'therapist_id': therapist_id,
+                    'patient_id': patient_id,
+                    'session_date': today,
                     'cpt_code': '90837',
                     'icd10_code': 'F33.1',
                     'fee': 0.00,  # Zero fee
@@ -545,10 +592,10 @@ class WorkflowTester:
             {
                 'name': 'Future session date',
                 'data': {
-                    'practice_id': str(self.practice.id),
-                    'therapist_id': str(self.therapists[0].id),
-                    'patient_id': str(self.patients[0].id),
-                    'session_date': str(date.today() + timedelta(days=7)),  # Future
+                    'practice_id': practice_id,
+                    'therapist_id': therapist_id,
+                    'patient_id': patient_id,
+                    'session_date': next_week,  # Future
                     'cpt_code': '90837',
                     'icd10_code': 'F33.1',
                     'fee': 175.00,
@@ -560,10 +607,10 @@ class WorkflowTester:
             {
                 'name': 'Invalid ICD-10 code',
                 'data': {
-                    'practice_id': str(self.practice.id),
-                    'therapist_id': str(self.therapists[0].id),
-                    'patient_id': str(self.patients[0].id),
-                    'session_date': str(date.today()),
+                    'practice_id': practice_id,
+                    'therapist_id': therapist_id,
+                    'patient_id': patient_id,
+                    'session_date': today,
                     'cpt_code': '90837',
                     'icd10_code': '123',  # Invalid format
                     'fee': 175.00,
@@ -574,107 +621,92 @@ class WorkflowTester:
             }
         ]
         
+        # Serialize each request body once, up front
+        for scenario in failure_scenarios:
+            scenario['body'] = json.dumps(scenario['data']).encode('utf-8')
+        
+        # Every expected message in one pattern, so each response's errors
+        # are scanned in a single pass
+        expected_pattern = re.compile(
+            '|'.join(re.escape(scenario['expected_error']) for scenario in failure_scenarios)
+        )
+        
+        url = f'{API_PREFIX}/claims/prepare'
         for scenario in failure_scenarios:
             response = self.client.post(
-                f'{API_PREFIX}/claims/prepare',
-                data=json.dumps(scenario['data']),
-                content_type='application/json'
+                url, scenario['body'], content_type='application/json', **headers
             )
             
-            if response.status_code in [400, 422]:
-                response_data = response.json()
-                if 'validation_errors' in response_data:
-                    errors = response_data['validation_errors']
-                    if any(scenario['expected_error'] in str(error) for error in errors):
-                        self.print_success(f"✓ {scenario['name']}: Correctly rejected")
-                    else:
-                        self.print_failure(f"✗ {scenario['name']}: Unexpected error")
-                        self.print_info("Errors:", errors)
-                else:
-                    self.print_warning(f"⚠ {scenario['name']}: No validation errors in response")
-            else:
-                self.print_failure(f"✗ {scenario['name']}: Unexpected status {response.status_code}")
+            assert response.status_code in [400, 422], (
+                f"{scenario['name']}: unexpected status {response.status_code}"
+            )
+            response_data = response.json()
+            assert response_data['status'] == 'INVALID', f"{scenario['name']}: {response_data}"
+            
+            errors = response_data['validation_errors']
+            found = set(expected_pattern.findall('\n'.join(str(error) for error in errors)))
+            assert scenario['expected_error'] in found, f"{scenario['name']}: unexpected errors {errors}"
+            self.print_success(f"✓ {scenario['name']}: Correctly rejected")
     
     def test_eligibility_check(self):
         """Test insurance eligibility verification."""
         self.print_step("Testing Insurance Eligibility Verification")
         
         # This would typically call an external API
-        # For now, we'll simulate the check
+        # For now, we'll check the stored coverage
         
-        from members.models import EligibilityCheck
+        # Patient is joined in so the loop below never queries
+        coverages = list(
+            InsuranceCoverage.objects
+            .filter(practice=self.practice, is_active=True)
+            .select_related('patient')[:2]
+        )
+        assert len(coverages) == 2, f"Expected 2 active coverages, found {len(coverages)}"
         
-        for coverage in MemberCoverage.objects.filter(practice=self.practice)[:2]:
-            check = EligibilityCheck.objects.create(
-                practice=self.practice,
-                member_coverage=coverage,
-                method='api',
-                status='success',
-                is_eligible=True,
-                copay_amount=coverage.insurance_plan.specialist_copay,
-                deductible_remaining=Decimal("250.00"),
-                out_of_pocket_remaining=Decimal("3000.00"),
-                response_time_ms=random.randint(100, 500),
-                initiated_by='billing_user'
+        for coverage in coverages:
+            assert coverage.copay_amount == PAYERS[coverage.patient.payer_id][1], coverage
+            self.print_success(
+                f"Eligibility verified for {coverage.patient} (copay ${coverage.copay_amount})"
             )
-            
-            self.print_success(f"Eligibility verified for {coverage.patient}")
     
     def test_analytics_access(self):
         """Test analytics and reporting access."""
         self.print_step("Testing Analytics Access")
         
-        from analytics.models import PracticeMetrics, TherapistPerformance
+        # Session totals in a single aggregate query
+        totals = Session.objects.filter(practice=self.practice).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            billed=Sum('fee')
+        )
+        assert totals['total'] == totals['completed'] == len(self.sessions), totals
+        assert totals['billed'] == sum(session.fee for session in self.sessions), totals
         
-        # Create sample metrics
-        metrics = PracticeMetrics.objects.create(
+        # Create the practice summary
+        summary = PracticeSummary.objects.create(
             practice=self.practice,
-            metric_date=date.today(),
-            metric_period='daily',
-            total_patients=len(self.patients),
-            active_patients=len(self.patients),
-            total_sessions=len(self.sessions),
-            completed_sessions=len([s for s in self.sessions if s.status == 'completed']),
-            total_billed=sum(s.fee for s in self.sessions),
-            total_copays=sum(s.copay_collected for s in self.sessions),
-            claims_submitted=len(self.claims),
-            therapist_utilization=75.5,
-            retention_rate=85.0
+            total_sessions=totals['total'],
+            total_claims=len(self.claims),
+            total_revenue=totals['billed']
         )
         
-        self.print_success("Practice metrics computed")
-        self.print_info("Today's metrics:", {
-            'total_sessions': metrics.total_sessions,
-            'total_billed': float(metrics.total_billed),
-            'utilization': metrics.therapist_utilization
+        self.print_success("Practice summary computed")
+        self.print_info("Today's summary:", {
+            'total_sessions': summary.total_sessions,
+            'total_claims': summary.total_claims,
+            'total_revenue': float(summary.total_revenue)
         })
-        
-        # Create therapist performance records
-        for therapist in self.therapists:
-            perf = TherapistPerformance.objects.create(
-                practice=self.practice,
-                therapist=therapist,
-                period_start=date.today() - timedelta(days=30),
-                period_end=date.today(),
-                period_type='monthly',
-                sessions_completed=random.randint(40, 60),
-                total_billed=Decimal(random.randint(8000, 12000)),
-                patient_satisfaction_score=random.uniform(4.0, 5.0),
-                documentation_compliance_rate=random.uniform(85, 100),
-                utilization_rate=random.uniform(70, 90)
-            )
-        
-        self.print_success("Therapist performance metrics generated")
     
     def test_tenant_isolation(self):
         """Test multi-tenant data isolation."""
         self.print_step("Testing Multi-Tenant Isolation")
         
-        # Create another practice
+        # Create another practice; a generated NPI keeps it from colliding
+        # with practices created by tests on other workers
         other_practice = Practice.objects.create(
             name="Competitor Therapy",
-            npi="9876543210",
-            tax_id="98-7654321",
+            npi=str(uuid.uuid4().int)[:10],
+            tax_id=f"98-{uuid.uuid4().hex[:7]}",
             address_line1="456 Other St",
             city="Cambridge",
             state="MA",
@@ -691,216 +723,390 @@ class WorkflowTester:
             payer_id="EVIL"
         )
         
-        # Try to access other practice's data (should fail)
-        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens["therapist"]}')
-        
-        # This would normally be blocked by middleware/permissions
-        # For testing, we'll verify the data is properly separated
-        
+        # The practice-scoped queryset must not reach the other practice
         our_patients = Patient.objects.filter(practice=self.practice)
-        other_patients = Patient.objects.filter(practice=other_practice)
-        
-        if our_patients.count() > 0 and other_patients.count() > 0:
-            if not our_patients.filter(id=other_patient.id).exists():
-                self.print_success("Tenant isolation verified - cannot access other practice's data")
-            else:
-                self.print_failure("Tenant isolation FAILED - accessed other practice's data!")
+        assert our_patients.exists(), "No patients in our practice"
+        assert not our_patients.filter(id=other_patient.id).exists(), (
+            "Tenant isolation FAILED - accessed other practice's data!"
+        )
         
-        # Clean up
-        other_practice.delete()
+        # And the API only lists members of the caller's active practice
+        response = self.client.get(
+            f'{API_PREFIX}/auth/practice-members/', **self.auth_headers['admin']
+        )
+        assert response.status_code == 200, response.content.decode()
+        data = response.json()
+        assert data['practice']['id'] == str(self.practice.id), data['practice']
+        assert {member['username'] for member in data['members']} == {
+            user.username for user in self.users.values()
+        }, data['members']
+        
+        self.print_success("Tenant isolation verified - cannot access other practice's data")
     
     def test_role_based_permissions(self):
         """Test role-based access control."""
         self.print_step("Testing Role-Based Permissions")
         
+        # An allowed claims POST with an empty body is rejected as invalid
+        # (400), not forbidden
         test_cases = [
             {
                 'role': 'admin',
                 'endpoint': f'{API_PREFIX}/claims/prepare',
                 'method': 'POST',
-                'expected': 'allowed',
+                'expected_status': 400,
                 'description': 'Admin accessing claims'
             },
+            {
+                'role': 'billing',
+                'endpoint': f'{API_PREFIX}/claims/prepare',
+                'method': 'POST',
+                'expected_status': 400,
+                'description': 'Billing accessing claims'
+            },
+            {
+                'role': 'admin',
+                'endpoint': f'{API_PREFIX}/auth/practice-members/',
+                'method': 'GET',
+                'expected_status': 200,
+                'description': 'Admin listing practice members'
+            },
             {
                 'role': 'therapist',
-                'endpoint': f'{API_PREFIX}/analytics/metrics',
+                'endpoint': f'{API_PREFIX}/auth/practice-members/',
                 'method': 'GET',
-                'expected': 'denied',
-                'description': 'Therapist accessing analytics'
+                'expected_status': 403,
+                'description': 'Therapist listing practice members'
             },
             {
                 'role': 'billing',
-                'endpoint': f'{API_PREFIX}/claims/prepare',
-                'method': 'POST',
-                'expected': 'allowed',
-                'description': 'Billing accessing claims'
+                'endpoint': f'{API_PREFIX}/auth/practice-members/',
+                'method': 'GET',
+                'expected_status': 403,
+                'description': 'Billing listing practice members'
             }
         ]
         
         for test in test_cases:
-            if test['role'] in self.tokens:
-                self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens[test["role"]]}')
-                
-                # Make request based on method
-                if test['method'] == 'GET':
-                    response = self.client.get(test['endpoint'])
-                else:
-                    # Use minimal valid data for POST
-                    response = self.client.post(
-                        test['endpoint'],
-                        data={},
-                        content_type='application/json'
-                    )
-                
-                # Check expected result
-                if test['expected'] == 'allowed':
-                    # Should not be 403 Forbidden
-                    if response.status_code != 403:
-                        self.print_success(f"✓ {test['description']}: Access granted")
-                    else:
-                        self.print_failure(f"✗ {test['description']}: Incorrectly denied")
-                else:
-                    # Should be 403 Forbidden or 401 Unauthorized
-                    if response.status_code in [401, 403]:
-                        self.print_success(f"✓ {test['description']}: Access denied as expected")
-                    else:
-                        self.print_failure(f"✗ {test['description']}: Should have been denied")
+            headers = self.auth_headers[test['role']]
+            
+            # Make request based on method
+            if test['method'] == 'GET':
+                response = self.client.get(test['endpoint'], **headers)
+            else:
+                # Use minimal valid data for POST
+                response = self.client.post(
+                    test['endpoint'],
+                    data={},
+                    content_type='application/json',
+                    **headers
+                )
+            
+            assert response.status_code == test['expected_status'], (
+                f"{test['description']}: expected {test['expected_status']}, "
+                f"got {response.status_code}"
+            )
+            if response.status_code == 403:
+                self.print_success(f"✓ {test['description']}: Access denied as expected")
+            else:
+                self.print_success(f"✓ {test['description']}: Access granted")
     
     def test_rate_limiting(self):
         """Test API rate limiting."""
         self.print_step("Testing Rate Limiting")
         
-        # Set a low-privilege token
-        self.client.credentials(HTTP_AUTHORIZATION=f'Token {self.tokens["therapist"]}')
+        # Sent with a low-privilege token
+        headers = self.auth_headers['therapist']
         
         # Make multiple rapid requests
         endpoint = f'{API_PREFIX}/claims/health'
         request_count = 0
         rate_limited = False
+        # Low rate limit headers, reported in one line after the loop
+        low_remaining = []
         
         # Make 20 rapid requests
         for i in range(20):
-            response = self.client.get(endpoint)
+            response = self.client.get(endpoint, **headers)
             request_count += 1
             
+            # The health check answers until the limiter steps in
+            assert response.status_code in [200, 429], response.content.decode()
+            if request_count == 1:
+                assert response.status_code == 200, response.content.decode()
+                assert response.json()['status'] == 'healthy', response.json()
+            
             # Check for rate limit headers
-            if 'X-RateLimit-Remaining' in response:
-                remaining = int(response['X-RateLimit-Remaining'])
-                if remaining < 10:
-                    self.print_warning(f"Rate limit approaching: {remaining} requests remaining")
+            remaining = response.headers.get(RATE_LIMIT_HEADER)
+            if remaining is not None and int(remaining) < 10:
+                low_remaining.append(int(remaining))
             
             # Check if we got rate limited
             if response.status_code == 429:
                 rate_limited = True
-                self.print_success(f"Rate limiting activated after {request_count} requests")
                 break
         
-        if not rate_limited:
-            self.print_info(f"Made {request_count} requests without hitting rate limit")
-            self.print_success("Rate limiting configured with appropriate thresholds")
+        if low_remaining:
+            self.print_warning(
+                f"Rate limit approaching: remaining dropped to {min(low_remaining)} "
+                f"({len(low_remaining)} responses under 10)"
+            )
+        
+        if rate_limited:
+            self.print_success(f"Rate limiting activated after {request_count} requests")
+        else:
+            self.print_success(f"Made {request_count} requests without hitting rate limit")
+
+
+# Tester attributes populated by the seeding steps
+SEEDED_ATTRIBUTES = (
+    'users', 'tokens', 'auth_headers', 'practice', 'therapists', 'patients',
+    'sessions', '_therapist_ids', '_patient_ids', '_patient_payers',
+)
+
+
+@override_settings(ROOT_URLCONF=API_URLCONF)
+class WorkflowTest(TestCase):
+    """
+    Workflow stages run as independent tests over shared seeded data.
+    
+    Each stage asserts on the responses and rows it produces, so a wrapper
+    test fails with the stage's assertion message.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        """
+        Seed the practice, users, therapists, patients and sessions.
+        
+        This runs once per class; each test is rolled back to this point,
+        so the stages only pay for the rows they create themselves.
+        """
+        seeder = WorkflowTester()
+        seeder.test_user_registration()
+        seeder.test_practice_setup()
+        seeder.test_provider_network_setup()
+        seeder.test_patient_registration()
+        seeder.test_insurance_coverage_setup()
+        seeder.test_session_creation()
+        seeder.flush_output()
+        
+        cls.seeded = {name: getattr(seeder, name) for name in SEEDED_ATTRIBUTES}
+    
+    def setUp(self):
+        """Give each test a fresh tester over the seeded data."""
+        self.tester = WorkflowTester()
+        for name, value in self.seeded.items():
+            setattr(self.tester, name, value)
+    
+    def tearDown(self):
+        self.tester.flush_output()
+    
+    def test_workflow_setup(self):
+        """Test that the seeded workflow data is in place."""
+        self.assertEqual(self.tester.practice.therapists.count(), len(self.tester.therapists))
+        self.assertEqual(len(self.tester.patients), 3)
+        self.assertEqual(len(self.tester.sessions), 10)
+    
+    def test_claim_preparation_success(self):
+        """Test successful claim preparation."""
+        self.tester.test_claim_preparation_success()
+    
+    def test_claim_preparation_failures(self):
+        """Test claim preparation failure scenarios."""
+        self.tester.test_claim_preparation_failures()
+    
+    def test_eligibility_check(self):
+        """Test insurance eligibility verification."""
+        self.tester.test_eligibility_check()
+    
+    def test_analytics_access(self):
+        """Test analytics and reporting access."""
+        self.tester.test_analytics_access()
+    
+    def test_tenant_isolation(self):
+        """Test multi-tenant data isolation."""
+        self.tester.test_tenant_isolation()
+    
+    def test_role_based_permissions(self):
+        """Test role-based access control."""
+        self.tester.test_role_based_permissions()
+    
+    def test_rate_limiting(self):
+        """Test API rate limiting."""
+        self.tester.test_rate_limiting()
 
 
-def run_integration_tests():
+def run_integration_tests(verbose: bool = False):
     """Run the complete integration test suite."""
-    tester = WorkflowTester()
-    tester.run_all_tests()
+    if IN_MEMORY_DB:
+        from django.core.management import call_command
+        call_command('migrate', run_syncdb=True, verbosity=0)
+    
+    # Lets the in-process client through ALLOWED_HOSTS as 'testserver'
+    setup_test_environment()
+    
+    with override_settings(ROOT_URLCONF=API_URLCONF):
+        tester = WorkflowTester(verbose=verbose)
+        tester.run_all_tests()
 
 
-def run_api_documentation():
-    """Generate and display API documentation."""
-    print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}API DOCUMENTATION{Colors.ENDC}")
-    print(f"{Colors.HEADER}{Colors.BOLD}{'='*60}{Colors.ENDC}")
+@dataclass(frozen=True, slots=True)
+class Endpoint:
+    """An API endpoint as listed in the generated documentation."""
     
-    endpoints = [
-        {
-            'method': 'POST',
-            'path': '/api/v1/claims/prepare',
-            'description': 'Prepare a claim from session data',
-            'auth': 'Required (Token)',
-            'roles': ['admin', 'billing'],
-            'body': {
-                'practice_id': 'UUID',
-                'therapist_id': 'UUID',
-                'patient_id': 'UUID',
-                'session_date': 'YYYY-MM-DD',
-                'cpt_code': 'string',
-                'icd10_code': 'string',
-                'fee': 'decimal',
-                'copay_collected': 'decimal',
-                'payer_id': 'string'
-            }
-        },
-        {
-            'method': 'GET',
-            'path': '/api/v1/claims/health',
-            'description': 'Health check endpoint',
-            'auth': 'None',
-            'roles': ['public'],
-            'body': None
-        },
-        {
-            'method': 'POST',
-            'path': '/api/v1/auth/register',
-            'description': 'Register new user',
-            'auth': 'None',
-            'roles': ['public'],
-            'body': {
-                'username': 'string',
-                'email': 'string',
-                'password': 'string',
-                'role': 'string'
-            }
-        },
-        {
-            'method': 'POST',
-            'path': '/api/v1/auth/token',
-            'description': 'Get authentication token',
-            'auth': 'Basic',
-            'roles': ['authenticated'],
-            'body': {
-                'username': 'string',
-                'password': 'string'
-            }
-        },
-        {
-            'method': 'GET',
-            'path': '/api/v1/members/{member_id}/eligibility',
-            'description': 'Check insurance eligibility',
-            'auth': 'Required (Token)',
-            'roles': ['admin', 'billing', 'front_desk'],
-            'body': None
-        },
+    method: str
+    path: str
+    description: str
+    auth: str
+    roles: Tuple[str, ...]
+    body: Optional[Tuple[Tuple[str, str], ...]] = None  # (field, type) pairs
+    roles_str: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        object.__setattr__(self, 'roles_str', ', '.join(self.roles))
+
+
+_ENDPOINTS: Tuple[Endpoint, ...] = (
+    Endpoint(
+        method='POST',
+        path='/api/v1/claims/prepare',
+        description='Prepare a claim from session data',
+        auth='Required (Token)',
+        roles=('admin', 'billing'),
+        body=(
+            ('practice_id', 'UUID'),
+            ('therapist_id', 'UUID'),
+            ('patient_id', 'UUID'),
+            ('session_date', 'YYYY-MM-DD'),
+            ('cpt_code', 'string'),
+            ('icd10_code', 'string'),
+            ('fee', 'decimal'),
+            ('copay_collected', 'decimal'),
+            ('payer_id', 'string')
+        )
+    ),
+    Endpoint(
+        method='GET',
+        path='/api/v1/claims/health',
+        description='Health check endpoint',
+        auth='None',
+        roles=('public',)
+    ),
+    Endpoint(
+        method='POST',
+        path='/api/v1/auth/register',
+        description='Register new user',
+        auth='None',
+        roles=('public',),
+        body=(
+            ('username', 'string'),
+            ('email', 'string'),
+            ('password', 'string'),
+            ('role', 'string')
+        )
+    ),
+    Endpoint(
+        method='POST',
+        path='/api/v1/auth/token',
+        description='Get authentication token',
+        auth='Basic',
+        roles=('authenticated',),
+        body=(
+            ('username', 'string'),
+            ('password', 'string')
+        )
+    ),
+    Endpoint(
+        method='GET',
+        path='/api/v1/members/{member_id}/eligibility',
+        description='Check insurance eligibility',
+        auth='Required (Token)',
+        roles=('admin', 'billing', 'front_desk')
+    ),
+    Endpoint(
+        method='GET',
+        path='/api/v1/analytics/practice/metrics',
+        description='Get practice metrics',
+        auth='Required (Token)',
+        roles=('admin', 'analytics')
+    ),
+)
+
+
+# Documentation templates, filled in per endpoint by _render_docs
+_DOCS_TITLE = f"\n{_RULE}\n{_HEADER_FMT.format(msg='API DOCUMENTATION')}\n{_RULE}\n"
+_ENDPOINT_DOC_FMT = (
+    _ENDPOINT_FMT.format(msg='{method} {path}') + "\n"
+    "  Description: {description}\n"
+    "  Auth: {auth}\n"
+    "  Roles: {roles}\n"
+    "{body}"
+)
+_BODY_HEADING = "  Request Body:\n"
+_BODY_FIELD_FMT = "    - {name}: {dtype}\n"
+
+
+@functools.cache
+def _render_docs() -> str:
+    """Render the API documentation; _ENDPOINTS never changes, so once."""
+    return _DOCS_TITLE + ''.join(
+        _ENDPOINT_DOC_FMT.format(
+            method=endpoint.method,
+            path=endpoint.path,
+            description=endpoint.description,
+            auth=endpoint.auth,
+            roles=endpoint.roles_str,
+            body=_BODY_HEADING + ''.join(
+                _BODY_FIELD_FMT.format(name=name, dtype=dtype) for name, dtype in endpoint.body
+            ) if endpoint.body else ''
+        )
+        for endpoint in _ENDPOINTS
+    )
+
+
+@functools.cache
+def _render_docs_json() -> str:
+    """Serialize the API documentation as JSON, once."""
+    return json.dumps([
         {
-            'method': 'GET',
-            'path': '/api/v1/analytics/practice/metrics',
-            'description': 'Get practice metrics',
-            'auth': 'Required (Token)',
-            'roles': ['admin', 'analytics'],
-            'body': None
+            'method': endpoint.method,
+            'path': endpoint.path,
+            'description': endpoint.description,
+            'auth': endpoint.auth,
+            'roles': list(endpoint.roles),
+            'body': dict(endpoint.body) if endpoint.body else None
         }
-    ]
-    
-    for endpoint in endpoints:
-        print(f"\n{Colors.OKBLUE}{endpoint['method']} {endpoint['path']}{Colors.ENDC}")
-        print(f"  Description: {endpoint['description']}")
-        print(f"  Auth: {endpoint['auth']}")
-        print(f"  Roles: {', '.join(endpoint['roles'])}")
-        if endpoint['body']:
-            print(f"  Request Body:")
-            for field, dtype in endpoint['body'].items():
-                print(f"    - {field}: {dtype}")
+        for endpoint in _ENDPOINTS
+    ], indent=2) + "\n"
+
+
+def run_api_documentation(as_json: bool = False):
+    """Generate and display API documentation."""
+    sys.stdout.write(_render_docs_json() if as_json else _render_docs())
+
+
+def parse_args(argv=None):
+    """Parse the script's command line."""
+    parser = argparse.ArgumentParser(description="Clara Healthcare Backend workflow test script")
+    parser.add_argument('--docs', action='store_true',
+                        help="print the API documentation instead of running the workflow")
+    parser.add_argument('--json', action='store_true',
+                        help="with --docs, print the documentation as JSON")
+    parser.add_argument('-v', '--verbose', action='store_true',
+                        help="include response payloads in the output")
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    import sys
+    args = parse_args()
     
-    if len(sys.argv) > 1 and sys.argv[1] == '--docs':
-        run_api_documentation()
+    if args.docs:
+        run_api_documentation(as_json=args.json)
     else:
         try:
-            run_integration_tests()
-            print(f"\n{Colors.OKGREEN}{Colors.BOLD}✅ ALL TESTS PASSED!{Colors.ENDC}")
+            run_integration_tests(verbose=args.verbose)
+            print(_PASSED_FMT.format(msg="✅ ALL TESTS PASSED!"))
         except Exception as e:
-            print(f"\n{Colors.FAIL}{Colors.BOLD}❌ TEST SUITE FAILED: {str(e)}{Colors.ENDC}")
-            sys.exit(1)
\ No newline at end of file
+            print(_FAILED_FMT.format(msg=f"❌ TEST SUITE FAILED: {str(e)}"))
+            sys.exit(1)